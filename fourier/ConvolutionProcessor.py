@@ -0,0 +1,145 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from FFTProcessor import FFTProcessor
+
+class ConvolutionProcessor:
+    def __init__(self, direct_threshold=64, min_fft_size=256):
+        self.direct_threshold = direct_threshold
+        self.min_fft_size = min_fft_size
+        self.FFTProcessor = FFTProcessor()
+
+    def _next_pow2(self, n):
+        return 1 << max(n - 1, 0).bit_length()
+
+    def _prepare_kernel(self, kernel, max_length=None):
+        M = len(kernel)
+        L = max(self._next_pow2(4 * M), self.min_fft_size)
+        if max_length is not None:
+            L = min(L, self._next_pow2(max_length))
+        # blocks of at least M - 1 samples keep every tail inside the next block
+        L = max(L, self._next_pow2(2 * M - 1))
+        padded = np.zeros((1, L))
+        padded[0, :M] = kernel
+        return L, self.FFTProcessor.compute_rfft_batch(padded)[0]
+
+    def _filter_blocks(self, frames, H):
+        # blocks of every channel go through the FFT together as one batch
+        L = frames.shape[-1]
+        spectra = self.FFTProcessor.compute_rfft_batch(frames.reshape(-1, L)) * H
+        return self.FFTProcessor.compute_irfft_batch(spectra, L).reshape(frames.shape)
+
+    def _overlap_add(self, x, M, L, H):
+        channels, N = x.shape[:-1], x.shape[-1]
+        B = L - M + 1
+        n_blocks = -(-N // B)
+        blocks = np.zeros(channels + (n_blocks * B,))
+        blocks[..., :N] = x
+        frames = np.zeros(channels + (n_blocks, L))
+        frames[..., :B] = blocks.reshape(channels + (n_blocks, B))
+        y = self._filter_blocks(frames, H)
+
+        out = np.zeros(channels + (n_blocks + 1, B))
+        out[..., :n_blocks, :] += y[..., :B]
+        out[..., 1:, :M - 1] += y[..., B:]
+        return out.reshape(channels + (-1,))[..., :N + M - 1]
+
+    def _overlap_save(self, x, M, L, H):
+        channels, N = x.shape[:-1], x.shape[-1]
+        B = L - M + 1
+        n_blocks = -(-(N + M - 1) // B)
+        padded = np.zeros(channels + ((n_blocks - 1) * B + L,))
+        padded[..., M - 1:M - 1 + N] = x
+        frames = sliding_window_view(padded, L, axis=-1)[..., ::B, :][..., :n_blocks, :]
+        y = self._filter_blocks(frames, H)
+        return y[..., M - 1:].reshape(channels + (-1,))[..., :N + M - 1]
+
+    def _select_mode(self, full, N, M, mode):
+        if mode == "full":
+            return full
+        if mode == "same":
+            length = max(N, M)
+            start = (N + M - 1 - length) // 2
+            return full[start:start + length]
+        if mode == "valid":
+            length = max(N, M) - min(N, M) + 1
+            start = min(N, M) - 1
+            return full[start:start + length]
+        raise ValueError("Mode must be 'full', 'same' or 'valid'")
+
+    def _use_direct(self, method, M):
+        if method == "auto":
+            return M <= self.direct_threshold
+        if method not in ("direct", "fft"):
+            raise ValueError("Method must be 'auto', 'direct' or 'fft'")
+        return method == "direct"
+
+    def _convolve_direct(self, x, h):
+        if x.ndim == 1:
+            return np.convolve(x, h)
+        N = x.shape[-1]
+        out = np.zeros(x.shape[:-1] + (N + len(h) - 1,))
+        for k, tap in enumerate(h):
+            out[..., k:k + N] += tap * x
+        return out
+
+    def _convolve_full(self, x, h, method, block_mode, prepared=None):
+        M = len(h)
+        if self._use_direct(method, M):
+            return self._convolve_direct(x, h)
+
+        L, H = prepared or self._prepare_kernel(h, x.shape[-1] + M - 1)
+        if block_mode == "overlap_add":
+            return self._overlap_add(x, M, L, H)
+        if block_mode == "overlap_save":
+            return self._overlap_save(x, M, L, H)
+        raise ValueError("Block mode must be 'overlap_add' or 'overlap_save'")
+
+    def convolve(self, signal, kernel, mode="full", method="auto", block_mode="overlap_add"):
+        x = np.asarray(signal, dtype=np.float64)
+        h = np.asarray(kernel, dtype=np.float64)
+        if len(x) == 0 or len(h) == 0:
+            raise ValueError("Signal and kernel must not be empty")
+
+        # (samples, channels) input is convolved down every column in one pass
+        full = self._convolve_full(x.T, h, method, block_mode).T
+        return self._select_mode(full, len(x), len(h), mode)
+
+    def correlate(self, signal, template, mode="full", method="auto", block_mode="overlap_add"):
+        template = np.asarray(template)
+        N, M = len(signal), len(template)
+        if mode != "same" or M <= N:
+            return self.convolve(signal, template[::-1], mode, method, block_mode)
+
+        # numpy swaps the inputs for a longer template, which rounds the 'same' window
+        # towards the end of the full output rather than the start
+        full = self.convolve(signal, template[::-1], "full", method, block_mode)
+        start = N // 2
+        return full[start:start + M]
+
+    def convolve_stream(self, chunks, kernel, method="auto", block_mode="overlap_save"):
+        h = np.asarray(kernel, dtype=np.float64)
+        M = len(h)
+        if M == 0:
+            raise ValueError("Kernel must not be empty")
+
+        prepared = None if self._use_direct(method, M) else self._prepare_kernel(h)
+        history = None
+        for chunk in chunks:
+            chunk = np.asarray(chunk, dtype=np.float64)
+            if history is None:
+                history = np.zeros((M - 1,) + chunk.shape[1:])
+            if len(chunk) == 0:
+                continue
+            extended = np.concatenate([history, chunk])
+            # (samples, channels) chunks are convolved down every column, as in convolve
+            full = self._convolve_full(extended.T, h, method, block_mode, prepared).T
+            yield full[M - 1:M - 1 + len(chunk)]
+            history = extended[len(extended) - (M - 1):]
+
+        if history is not None and M > 1:
+            full = self._convolve_full(history.T, h, method, block_mode, prepared).T
+            yield full[M - 1:2 * (M - 1)]
+
+    def correlate_stream(self, chunks, template, method="auto", block_mode="overlap_save"):
+        return self.convolve_stream(chunks, np.asarray(template)[::-1], method, block_mode)
@@ -1,51 +1,69 @@
-import math
-import cmath
+import numpy as np
+from collections import OrderedDict
+
+from Spectrum import Spectrum
 
 class DFTProcessor:
+    _cache_limit_bytes = 256 * 1024 * 1024
+    _block_rows = 256
+    _twiddle_cache = OrderedDict()
+
     def __init__(self):
-        self.spectrum = []
-
-    def compute_dft(self, signal):
-        N = len(signal)
-        self.spectrum = [0j] * N
-        for k in range(N):
-            re_sum = 0.0
-            im_sum = 0.0
-            for n in range(N):
-                angle = (2 * math.pi * k * n) / N
-                re_sum += signal[n] * math.cos(angle)
-                im_sum -= signal[n] * math.sin(angle)
-            
-            self.spectrum[k] = complex(re_sum, im_sum)
-            
+        self.spectrum = Spectrum(np.array([], dtype=np.complex128))
+
+    def _build_twiddle_rows(self, k, N):
+        n = np.arange(N)
+        # k*n is reduced modulo N before scaling so large N keeps exact angles
+        angles = (-2.0 * np.pi / N) * (np.outer(k, n) % N)
+        return np.exp(1j * angles)
+
+    def _get_twiddle_matrix(self, N):
+        cache = DFTProcessor._twiddle_cache
+        if N in cache:
+            cache.move_to_end(N)
+            return cache[N]
+
+        if N * N * 16 > self._cache_limit_bytes:
+            return None
+
+        matrix = self._build_twiddle_rows(np.arange(N), N)
+        cache[N] = matrix
+        used = sum(m.nbytes for m in cache.values())
+        while used > self._cache_limit_bytes:
+            _, evicted = cache.popitem(last=False)
+            used -= evicted.nbytes
+        return matrix
+
+    def _transform(self, values, inverse=False):
+        N = len(values)
+        matrix = self._get_twiddle_matrix(N)
+        if matrix is not None:
+            return (matrix.conj() if inverse else matrix) @ values
+
+        result = np.empty(values.shape, dtype=np.complex128)
+        for start in range(0, N, self._block_rows):
+            k = np.arange(start, min(start + self._block_rows, N))
+            rows = self._build_twiddle_rows(k, N)
+            result[start:start + len(k)] = (rows.conj() if inverse else rows) @ values
+        return result
+
+    def compute_dft(self, signal, sample_rate=None):
+        x = np.asarray(signal, dtype=np.float64)
+        self.spectrum = Spectrum(self._transform(x), sample_rate)
         return self.spectrum
 
     def compute_idft(self, spectrum=None):
         if spectrum is None:
             spectrum = self.spectrum
 
-        N = len(spectrum)
-        restored_signal = [0.0] * N
-
-        for n in range(N):
-            re_sum = 0.0
-            
-            for k in range(N):
-                angle = (2 * math.pi * k * n) / N
-                
-                X_k = spectrum[k]
-                re_sum += (X_k.real * math.cos(angle)) - (X_k.imag * math.sin(angle))
-            
-            restored_signal[n] = re_sum / N
-            
-        return restored_signal
+        X = np.asarray(spectrum, dtype=np.complex128)
+        if len(X) == 0:
+            return np.array([], dtype=np.float64)
+
+        return self._transform(X, inverse=True).real / len(X)
 
     def get_amplitude_spectrum(self):
-        if not self.spectrum:
-            return []
-        return [abs(val) for val in self.spectrum]
+        return self.spectrum.magnitude
 
     def get_phase_spectrum(self):
-        if not self.spectrum:
-            return []
-        return [cmath.phase(val) for val in self.spectrum]
\ No newline at end of file
+        return self.spectrum.phase
@@ -0,0 +1,174 @@
+import numpy as np
+from collections import OrderedDict
+
+class FFTPlan:
+    _radices = (4, 2, 3, 5, 7)
+
+    def __init__(self, n, inverse=False, dtype=np.complex128):
+        self.n = n
+        self.inverse = inverse
+        self.dtype = np.dtype(dtype)
+        self.sign = 1.0 if inverse else -1.0
+
+        self.factors = self._factorize(n)
+        self.stages = []
+        self.radix2 = None
+        self.bluestein = None
+        if self.factors is None:
+            self._prepare_bluestein()
+        elif n & (n - 1) == 0:
+            self._prepare_radix2()
+        else:
+            self._prepare_stages()
+
+    def _factorize(self, n):
+        factors = []
+        for radix in self._radices:
+            while n % radix == 0:
+                factors.append(radix)
+                n //= radix
+        if n != 1:
+            return None
+        return factors
+
+    def _prepare_radix2(self):
+        bits = self.n.bit_length() - 1
+        indices = np.arange(self.n)
+        bit_reversed = np.zeros(self.n, dtype=np.intp)
+        for b in range(bits):
+            bit_reversed |= ((indices >> b) & 1) << (bits - 1 - b)
+        twiddles = np.exp(self.sign * 2j * np.pi * np.arange(self.n // 2) / self.n)
+        self.radix2 = (bit_reversed, twiddles.astype(self.dtype))
+
+    def _prepare_stages(self):
+        L = 1
+        for p in self.factors:
+            C = self.n // (L * p)
+            j = np.arange(p)[:, None]
+            k = np.arange(L)[None, :]
+            twiddles = np.exp(self.sign * 2j * np.pi * ((j * k) % (L * p)) / (L * p))
+            dft = np.exp(self.sign * 2j * np.pi * np.outer(np.arange(p), np.arange(p)) / p)
+            self.stages.append((
+                p, L, C,
+                twiddles[:, :, None].astype(self.dtype),
+                dft.astype(self.dtype),
+            ))
+            L *= p
+
+    def _prepare_bluestein(self):
+        N = self.n
+        n = np.arange(N)
+        chirp = np.exp(self.sign * 1j * np.pi * ((n * n) % (2 * N)) / N)
+        M = 1 << (2 * N - 2).bit_length()
+        kernel = np.zeros(M, dtype=np.complex128)
+        kernel[:N] = chirp.conj()
+        kernel[M - N + 1:] = chirp[1:][::-1].conj()
+
+        forward = FFTPlan(M, False, self.dtype)
+        backward = FFTPlan(M, True, self.dtype)
+        # the 1/M of the inner inverse transform is folded into the kernel spectrum
+        self.bluestein = (
+            chirp.astype(self.dtype),
+            forward.execute(kernel) / M,
+            forward,
+            backward,
+        )
+
+    def _butterfly(self, p, twiddles, dft, B, out):
+        # row 0 of every stage has unit twiddles, so only rows 1.. are multiplied
+        if p == 2:
+            t1 = B[..., 1, :, :] * twiddles[1]
+            np.add(B[..., 0, :, :], t1, out=out[..., 0, :, :])
+            np.subtract(B[..., 0, :, :], t1, out=out[..., 1, :, :])
+            return out
+        if p == 4:
+            t1 = B[..., 1, :, :] * twiddles[1]
+            t2 = B[..., 2, :, :] * twiddles[2]
+            t3 = B[..., 3, :, :] * twiddles[3]
+            s02 = np.add(B[..., 0, :, :], t2, out=out[..., 0, :, :])
+            d02 = np.subtract(B[..., 0, :, :], t2, out=out[..., 1, :, :])
+            s13 = np.add(t1, t3, out=t2)
+            d13 = np.subtract(t1, t3, out=t1)
+            d13 *= 1j * self.sign
+            np.subtract(s02, s13, out=out[..., 2, :, :])
+            np.subtract(d02, d13, out=out[..., 3, :, :])
+            s02 += s13
+            d02 += d13
+            return out
+
+        shape = out.shape
+        B = B * twiddles
+        out[...] = (dft @ B.reshape(shape[:-3] + (p, -1))).reshape(shape)
+        return out
+
+    def _execute_radix2(self, x):
+        # in-place butterflies on a bit-reversed copy, the fastest kernel for powers of two
+        bit_reversed, twiddles = self.radix2
+        N = self.n
+        data = x[..., bit_reversed]
+        half = 1
+        while half < N:
+            groups = data.reshape(data.shape[:-1] + (N // (2 * half), 2, half))
+            t = groups[..., 1, :] * twiddles[::N // (2 * half)]
+            groups[..., 1, :] = groups[..., 0, :] - t
+            groups[..., 0, :] += t
+            half *= 2
+        return data
+
+    def _execute_stages(self, x):
+        if not self.stages:
+            return x.copy()
+
+        batch = x.shape[:-1]
+        A = x.reshape(batch + (1, self.n))
+        for p, L, C, twiddles, dft in self.stages:
+            # Stockham step: split every length-L sub-transform into p interleaved
+            # parts, twiddle them and combine into length-L*p sub-transforms
+            B = np.swapaxes(A.reshape(batch + (L, p, C)), -3, -2)
+            out = np.empty(batch + (p, L, C), dtype=self.dtype)
+            A = self._butterfly(p, twiddles, dft, B, out).reshape(batch + (L * p, C))
+        return A.reshape(batch + (self.n,))
+
+    def _execute_bluestein(self, x):
+        chirp, kernel_spectrum, forward, backward = self.bluestein
+        padded = np.zeros(x.shape[:-1] + (forward.n,), dtype=self.dtype)
+        padded[..., :self.n] = x * chirp
+        conv = backward.execute(forward.execute(padded) * kernel_spectrum, normalize=False)
+        return conv[..., :self.n] * chirp
+
+    def execute(self, x, normalize=True):
+        x = np.asarray(x, dtype=self.dtype)
+        if x.shape[-1] != self.n:
+            raise ValueError(f"Plan is for size {self.n}, got {x.shape[-1]}")
+
+        if self.bluestein is not None:
+            result = self._execute_bluestein(x)
+        elif self.radix2 is not None:
+            result = self._execute_radix2(x)
+        else:
+            result = self._execute_stages(x)
+
+        if self.inverse and normalize:
+            result /= self.n
+        return result
+
+
+class FFTPlanner:
+    def __init__(self, max_plans=64):
+        self.max_plans = max_plans
+        self.plans = OrderedDict()
+
+    def get_plan(self, n, inverse=False, dtype=np.complex128):
+        key = (n, inverse, np.dtype(dtype))
+        if key in self.plans:
+            self.plans.move_to_end(key)
+            return self.plans[key]
+
+        plan = FFTPlan(n, inverse, dtype)
+        self.plans[key] = plan
+        if len(self.plans) > self.max_plans:
+            self.plans.popitem(last=False)
+        return plan
+
+    def clear(self):
+        self.plans.clear()
@@ -1,60 +1,232 @@
-import cmath
+import os
 import math
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from FFTPlanner import FFTPlanner
+from Spectrum import Spectrum
 
 class FFTProcessor:
+    _cache_limit = 32
+    _four_step_limit = 2
+    _rfft_twiddles = OrderedDict()
+    _chirps = OrderedDict()
+    _four_step_twiddles = OrderedDict()
+    _planner = FFTPlanner()
+
     def __init__(self):
-        self.spectrum = []
-
-    def compute_fft(self, signal):
-        n = len(signal)
-        if (n & (n - 1) == 0) and n > 0:
-            padded_signal = signal
-        else:
-            next_pow2 = 1
-            while next_pow2 < n:
-                next_pow2 *= 2
-            padded_signal = list(signal) + [0] * (next_pow2 - n)
-        self.spectrum = self._fft_recursive(padded_signal)
-        return self.spectrum
+        self.spectrum = Spectrum(np.array([], dtype=np.complex128))
 
-    def _fft_recursive(self, x):
-        N = len(x)
-        if N <= 1:
+    def _lru(self, cache, key, build, limit=None):
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        cache[key] = build()
+        if len(cache) > (limit or self._cache_limit):
+            cache.popitem(last=False)
+        return cache[key]
+
+    def _get_rfft_twiddles(self, N):
+        return self._lru(FFTProcessor._rfft_twiddles, N,
+                         lambda: np.exp(-2j * np.pi * np.arange(N // 2 + 1) / N))
+
+    def _build_chirp_z(self, N, M, chirp):
+        # chirp[j] = w^(j^2 / 2); the kernel holds w^(-j^2 / 2) for j in [-(N - 1), M - 1]
+        L = 1 << (N + M - 2).bit_length()
+        kernel = np.zeros(L, dtype=np.complex128)
+        kernel[:M] = 1.0 / chirp[:M]
+        kernel[L - N + 1:] = 1.0 / chirp[1:N][::-1]
+        return chirp[:N], chirp[:M], self._fft(kernel)
+
+    def _chirp_z(self, x, tables):
+        pre_chirp, post_chirp, kernel_spectrum = tables
+        N = x.shape[-1]
+        L = len(kernel_spectrum)
+        padded = np.zeros(x.shape[:-1] + (L,), dtype=np.complex128)
+        padded[..., :N] = x * pre_chirp
+        conv = self._fft(self._fft(padded) * kernel_spectrum, inverse=True) / L
+        return conv[..., :len(post_chirp)] * post_chirp
+
+    def _fft(self, x, inverse=False):
+        N = x.shape[-1]
+        if N == 0:
+            return np.zeros(x.shape, dtype=np.complex128)
+        # every size reuses a cached plan: radix-2, mixed radix when 2/3/5/7-smooth, Bluestein otherwise
+        return self.create_plan(N, inverse).execute(x, normalize=False)
+
+    def _rfft(self, x):
+        N = x.shape[-1]
+        if N < 2 or N % 2 != 0:
+            return self._fft(x)[..., :N // 2 + 1]
+
+        # pack even/odd samples as real/imag parts of one half-length complex signal
+        Z = self._fft(x[..., 0::2] + 1j * x[..., 1::2])
+        Z = np.concatenate([Z, Z[..., :1]], axis=-1)
+        Z_mirror = Z[..., ::-1].conj()
+        even = 0.5 * (Z + Z_mirror)
+        odd = -0.5j * (Z - Z_mirror)
+        return even + self._get_rfft_twiddles(N) * odd
+
+    def _irfft(self, X, N):
+        if N < 2 or N % 2 != 0:
+            tail = X[..., 1:N - N // 2][..., ::-1].conj()
+            full = np.concatenate([X[..., :N // 2 + 1], tail], axis=-1)
+            return self._fft(full, inverse=True).real / N
+
+        half = N // 2
+        X = X[..., :half + 1]
+        X_mirror = X[..., ::-1].conj()
+        even = 0.5 * (X + X_mirror)
+        odd = 0.5 * (X - X_mirror) * self._get_rfft_twiddles(N).conj()
+        z = self._fft((even + 1j * odd)[..., :half], inverse=True) / half
+
+        result = np.empty(X.shape[:-1] + (N,), dtype=np.float64)
+        result[..., 0::2] = z.real
+        result[..., 1::2] = z.imag
+        return result
+
+    def _pad_to_pow2(self, x):
+        n = x.shape[-1]
+        if n == 0 or n & (n - 1) == 0:
             return x
-        even = self._fft_recursive(x[0::2])
-        odd =  self._fft_recursive(x[1::2])
-        combined = [0] * N
-        
-        for k in range(N // 2):
-            angle = -2j * math.pi * k / N
-            t = cmath.exp(angle) * odd[k]
-            combined[k] = even[k] + t
-            combined[k + N // 2] = even[k] - t
-        return combined
+        next_pow2 = 1 << (n - 1).bit_length()
+        return np.concatenate([x, np.zeros(x.shape[:-1] + (next_pow2 - n,), dtype=x.dtype)], axis=-1)
+
+    def create_plan(self, n, inverse=False, dtype=np.complex128):
+        return FFTProcessor._planner.get_plan(n, inverse, dtype)
+
+    def compute_fft(self, signal, pad_to_pow2=False, sample_rate=None):
+        # (samples, channels) input is transposed so every channel is a row of one batched transform
+        x = np.asarray(signal, dtype=np.complex128).T
+        if pad_to_pow2:
+            x = self._pad_to_pow2(x)
+        self.spectrum = Spectrum(self._fft(x).T, sample_rate)
+        return self.spectrum
 
     def compute_ifft(self, spectrum=None):
         if spectrum is None:
             spectrum = self.spectrum
-        
-        if not spectrum:
-            return []
-
-        N = len(spectrum)
-        conjugated_spectrum = [x.conjugate() for x in spectrum]
-        transformed = self._fft_recursive(conjugated_spectrum)
-        restored_signal = []
-        for val in transformed:
-            res = val.conjugate().real / N
-            restored_signal.append(res)
-            
-        return restored_signal
+        if isinstance(spectrum, Spectrum) and spectrum.onesided:
+            return self.compute_irfft(spectrum)
+
+        X = np.asarray(spectrum, dtype=np.complex128)
+        if len(X) == 0:
+            return np.zeros(X.shape, dtype=np.float64)
+
+        return self._fft(X.T, inverse=True).real.T / len(X)
+
+    def compute_rfft(self, signal, pad_to_pow2=False, sample_rate=None):
+        x = np.asarray(signal, dtype=np.float64).T
+        if pad_to_pow2:
+            x = self._pad_to_pow2(x)
+        self.spectrum = Spectrum(self._rfft(x).T, sample_rate, x.shape[-1], onesided=True)
+        return self.spectrum
+
+    def compute_irfft(self, spectrum=None, n=None):
+        if spectrum is None:
+            spectrum = self.spectrum
+
+        X = np.asarray(spectrum, dtype=np.complex128)
+        if len(X) == 0:
+            return np.zeros(X.shape, dtype=np.float64)
+        if n is None:
+            n = spectrum.n if isinstance(spectrum, Spectrum) else 2 * (len(X) - 1)
+
+        return self._irfft(X.T, n).T
+
+    def _split_size(self, N):
+        for N1 in range(math.isqrt(N), 1, -1):
+            if N % N1 == 0:
+                return N1
+        return None
+
+    def _build_four_step_twiddles(self, N1, N2):
+        N = N1 * N2
+        return np.exp(-2j * np.pi * (np.outer(np.arange(N2), np.arange(N1)) % N) / N)
+
+    def _fft_rows_parallel(self, rows, pool, workers):
+        chunks = np.array_split(np.ascontiguousarray(rows), workers)
+        return np.concatenate(list(pool.map(self._fft, chunks)))
+
+    def compute_fft_parallel(self, signal, workers=None, use_processes=False, sample_rate=None):
+        x = np.asarray(signal, dtype=np.complex128)
+        N = len(x)
+        workers = workers or os.cpu_count() or 1
+        N1 = self._split_size(N) if N > 1 else None
+        if workers == 1 or N1 is None:
+            return self.compute_fft(x, sample_rate=sample_rate)
+
+        # four-step: N1-point FFTs down the columns, twiddle, N2-point FFTs along the rows,
+        # then read the result out transposed; channels just add more rows to each pass
+        N2 = N // N1
+        channels = x.shape[1:]
+        twiddles = self._lru(FFTProcessor._four_step_twiddles, N,
+                             lambda: self._build_four_step_twiddles(N1, N2), self._four_step_limit)
+        executor = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        with executor(max_workers=workers) as pool:
+            grid = x.T.reshape(channels + (N1, N2)).swapaxes(-1, -2)
+            columns = self._fft_rows_parallel(grid.reshape(-1, N1), pool, workers)
+            columns = columns.reshape(channels + (N2, N1)) * twiddles
+            rows = self._fft_rows_parallel(columns.swapaxes(-1, -2).reshape(-1, N2), pool, workers)
+
+        rows = rows.reshape(channels + (N1, N2)).swapaxes(-1, -2)
+        self.spectrum = Spectrum(rows.reshape(channels + (N,)).T, sample_rate)
+        return self.spectrum
+
+    def compute_czt(self, signal, m, w, a=1.0):
+        # channels become rows of one batched transform, as in compute_fft
+        x = np.asarray(signal, dtype=np.complex128).T
+        N = x.shape[-1]
+        j = np.arange(max(N, m))
+        chirp = np.complex128(w) ** (j * j / 2.0)
+        x = x * np.complex128(a) ** -np.arange(N)
+        return self._chirp_z(x, self._build_chirp_z(N, m, chirp)).T
+
+    def compute_zoom_fft(self, signal, f_start, f_stop, m, sample_rate):
+        x = np.asarray(signal, dtype=np.complex128).T
+        N = x.shape[-1]
+        step = (f_stop - f_start) / (m - 1) if m > 1 else 0.0
+
+        def build():
+            j = np.arange(max(N, m))
+            return self._build_chirp_z(N, m, np.exp(-1j * np.pi * step / sample_rate * j * j))
+
+        tables = self._lru(FFTProcessor._chirps, ("zoom", N, m, step / sample_rate), build)
+        x = x * np.exp(-2j * np.pi * f_start / sample_rate * np.arange(N))
+        freqs = f_start + step * np.arange(m)
+        return freqs, self._chirp_z(x, tables).T
+
+    def compute_fft_batch(self, frames):
+        X = np.asarray(frames, dtype=np.complex128)
+        if X.ndim != 2:
+            raise ValueError("Frames must be a 2-D array of shape (n_frames, N)")
+        return self._fft(X)
+
+    def compute_ifft_batch(self, spectra):
+        X = np.asarray(spectra, dtype=np.complex128)
+        if X.ndim != 2:
+            raise ValueError("Spectra must be a 2-D array of shape (n_frames, N)")
+        if X.shape[1] == 0:
+            return np.zeros(X.shape, dtype=np.float64)
+        return self._fft(X, inverse=True).real / X.shape[1]
+
+    def compute_rfft_batch(self, frames):
+        x = np.asarray(frames, dtype=np.float64)
+        if x.ndim != 2:
+            raise ValueError("Frames must be a 2-D array of shape (n_frames, N)")
+        return self._rfft(x)
+
+    def compute_irfft_batch(self, spectra, n=None):
+        X = np.asarray(spectra, dtype=np.complex128)
+        if X.ndim != 2:
+            raise ValueError("Spectra must be a 2-D array of shape (n_frames, N // 2 + 1)")
+        if n is None:
+            n = 2 * (X.shape[1] - 1)
+        return self._irfft(X, n)
 
     def get_amplitude_spectrum(self):
-        if not self.spectrum:
-            return []
-        return [abs(val) for val in self.spectrum]
+        return self.spectrum.magnitude
 
     def get_phase_spectrum(self):
-        if not self.spectrum:
-            return []
-        return [cmath.phase(val) for val in self.spectrum]
\ No newline at end of file
+        return self.spectrum.phase
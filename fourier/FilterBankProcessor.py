@@ -0,0 +1,91 @@
+import numpy as np
+
+from FilterProcessor import FilterProcessor
+from STFTProcessor import STFTProcessor
+
+class FilterBankProcessor:
+    def __init__(self, n_bands=8, f_low=62.5, f_high=8000.0, edges=None, frame_size=2048, crossover=0.5):
+        if edges is None:
+            edges = np.geomspace(f_low, f_high, n_bands - 1) if n_bands > 1 else []
+        edges = np.asarray(edges, dtype=np.float64)
+        if np.any(edges <= 0) or np.any(np.diff(edges) <= 0):
+            raise ValueError("Band edges must be positive and increasing")
+
+        # K - 1 crossover frequencies split 0 .. Nyquist into K bands
+        self.edges = edges
+        self.n_bands = len(edges) + 1
+        self.crossover = crossover
+        self.STFTProcessor = STFTProcessor(frame_size, frame_size // 2, "hann")
+        self.FilterProcessor = FilterProcessor()
+
+    def get_band_masks(self, freqs):
+        freqs = np.asarray(freqs, dtype=np.float64)
+        lows = [np.zeros(len(freqs))]
+        previous = 0.0
+        for edge in self.edges:
+            width = self.crossover * (edge - previous)
+            lows.append(self.FilterProcessor.get_spectral_mask(freqs, "lowpass", [edge], "raised_cosine", width))
+            previous = edge
+        lows.append(np.ones(len(freqs)))
+        # neighbouring low-pass masks differ by one band, so the bands always sum to one
+        return np.diff(np.array(lows), axis=0)
+
+    def get_band_centers(self, sample_rate):
+        bounds = np.concatenate([[self.edges[0] / 2 if len(self.edges) else 0.0], self.edges, [sample_rate / 2.0]])
+        return np.sqrt(bounds[:-1] * bounds[1:])
+
+    def stream_split(self, chunks, sample_rate, length=None):
+        masks = self.get_band_masks(self.STFTProcessor.get_frequencies(sample_rate))
+
+        def band_frames():
+            for spectra in self.STFTProcessor.stream_stft(chunks):
+                # (frames, [channels,] bins) spectra become (frames, [channels,] bands, bins)
+                yield spectra[..., None, :] * masks
+
+        return self.STFTProcessor.stream_istft(band_frames(), length)
+
+    def _iter_blocks(self, x, block_size):
+        return (x[start:start + block_size] for start in range(0, len(x), block_size))
+
+    def split(self, signal, sample_rate, block_size=65536):
+        x = np.asarray(signal, dtype=np.float64)
+        # bands are written out as they are produced, so only a few frames of K spectra exist at once
+        bands = np.empty(x.shape + (self.n_bands,))
+        filled = 0
+        for part in self.stream_split(self._iter_blocks(x, block_size), sample_rate, len(x)):
+            bands[filled:filled + len(part)] = part
+            filled += len(part)
+        return bands
+
+    def compute_band_energies(self, signal, sample_rate, block_size=65536):
+        stft = self.STFTProcessor
+        x = np.asarray(signal, dtype=np.float64)
+        masks_squared = self.get_band_masks(stft.get_frequencies(sample_rate)) ** 2
+
+        # one-sided bins stand for both signs of frequency, except DC and Nyquist
+        weights = np.full(stft.frame_size // 2 + 1, 2.0)
+        weights[0] = 1.0
+        if stft.frame_size % 2 == 0:
+            weights[-1] = 1.0
+        scale = stft.frame_size * np.sum(stft.window ** 2)
+        energies = [(np.abs(spectra) ** 2 * weights) @ masks_squared.T / scale
+                    for spectra in stft.stream_stft(self._iter_blocks(x, block_size))]
+        if not energies:
+            return np.zeros((0,) + x.shape[1:] + (self.n_bands,))
+        return np.concatenate(energies)
+
+    def get_eq_curve(self, gains_db):
+        gains = 10.0 ** (np.asarray(gains_db, dtype=np.float64) / 20.0)
+        if len(gains) != self.n_bands:
+            raise ValueError(f"Expected {self.n_bands} band gains")
+        return lambda freqs: gains @ self.get_band_masks(freqs)
+
+    def apply_eq(self, signal, sample_rate, gains_db, block_size=65536, return_spectrum=False):
+        if len(self.edges) and self.edges[-1] >= sample_rate / 2.0:
+            # bands past Nyquist hold no frequencies, so their gains could never take effect
+            raise ValueError(f"Band edges must lie below the Nyquist frequency ({sample_rate / 2.0:g} Hz)")
+        # every band gain folds into a single mask, so EQ costs one filtering pass for any K
+        return self.FilterProcessor.apply_spectral_filter(signal, sample_rate, shape="eq",
+                                                          eq_curve=self.get_eq_curve(gains_db),
+                                                          block_size=block_size,
+                                                          return_spectrum=return_spectrum)
@@ -0,0 +1,105 @@
+import numpy as np
+from collections import OrderedDict
+from scipy.signal import butter, cheby1
+
+class FilterDesigner:
+    _cache_limit = 64
+    _designs = OrderedDict()
+    # main-lobe width of each window in units of fs / taps, used to size the filter
+    _fir_width_factors = {"hann": 3.1, "hamming": 3.3, "blackman": 5.5}
+
+    def __init__(self):
+        pass
+
+    def _validate(self, btype, cutoffs, sample_rate):
+        cutoffs = tuple(float(f) for f in np.atleast_1d(cutoffs))
+        nyquist = sample_rate / 2.0
+        if btype in ("lowpass", "highpass") and len(cutoffs) != 1:
+            raise ValueError(f"{btype} needs exactly one cutoff frequency")
+        if btype in ("bandpass", "bandstop") and (len(cutoffs) != 2 or cutoffs[0] >= cutoffs[1]):
+            raise ValueError(f"{btype} needs two increasing cutoff frequencies")
+        if btype not in ("lowpass", "highpass", "bandpass", "bandstop"):
+            raise ValueError(f"Unknown filter type: {btype}")
+        if any(f <= 0 or f >= nyquist for f in cutoffs):
+            raise ValueError(f"Cutoff frequencies must lie between 0 and {nyquist} Hz")
+        return cutoffs
+
+    def _cached(self, key, build):
+        cache = FilterDesigner._designs
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        cache[key] = build()
+        if len(cache) > self._cache_limit:
+            cache.popitem(last=False)
+        return cache[key]
+
+    def design_sos(self, family, btype, order, cutoffs, sample_rate, ripple_db=1.0):
+        cutoffs = self._validate(btype, cutoffs, sample_rate)
+        if order < 1:
+            raise ValueError("Filter order must be at least 1")
+
+        if family not in ("butterworth", "chebyshev"):
+            raise ValueError(f"Unknown filter family: {family}")
+
+        def build():
+            wn = cutoffs[0] if len(cutoffs) == 1 else list(cutoffs)
+            if family == "butterworth":
+                return butter(order, wn, btype=btype, output="sos", fs=sample_rate)
+            return cheby1(order, ripple_db, wn, btype=btype, output="sos", fs=sample_rate)
+
+        key = (family, btype, order, cutoffs, sample_rate, ripple_db if family == "chebyshev" else None)
+        return self._cached(key, build)
+
+    def design_butterworth(self, btype, order, cutoffs, sample_rate):
+        return self.design_sos("butterworth", btype, order, cutoffs, sample_rate)
+
+    def design_chebyshev(self, btype, order, cutoffs, sample_rate, ripple_db=1.0):
+        return self.design_sos("chebyshev", btype, order, cutoffs, sample_rate, ripple_db)
+
+    def get_fir_taps_count(self, transition_width, sample_rate, window="hamming"):
+        if window not in self._fir_width_factors:
+            raise ValueError(f"Unknown window: {window}")
+        if transition_width <= 0:
+            raise ValueError("Transition width must be positive")
+        taps = int(np.ceil(self._fir_width_factors[window] * sample_rate / transition_width))
+        # an odd length keeps the filter type I, which every band type allows
+        return taps | 1
+
+    def _symmetric_window(self, name, taps):
+        if taps == 1:
+            return np.ones(1)
+        phase = 2.0 * np.pi * np.arange(taps) / (taps - 1)
+        if name == "hann":
+            return 0.5 - 0.5 * np.cos(phase)
+        if name == "hamming":
+            return 0.54 - 0.46 * np.cos(phase)
+        return 0.42 - 0.5 * np.cos(phase) + 0.08 * np.cos(2 * phase)
+
+    def _windowed_sinc(self, cutoff, sample_rate, window):
+        taps = len(window)
+        n = np.arange(taps) - (taps - 1) / 2.0
+        h = np.sinc(2.0 * cutoff / sample_rate * n) * window
+        return h / np.sum(h)
+
+    def design_fir(self, btype, cutoffs, sample_rate, transition_width=None, window="hamming"):
+        cutoffs = self._validate(btype, cutoffs, sample_rate)
+        if transition_width is None:
+            transition_width = 0.1 * min(cutoffs)
+        taps = self.get_fir_taps_count(transition_width, sample_rate, window)
+
+        def build():
+            w = self._symmetric_window(window, taps)
+            impulse = np.zeros(taps)
+            impulse[taps // 2] = 1.0
+            low = self._windowed_sinc(cutoffs[0], sample_rate, w)
+            if btype == "lowpass":
+                return low
+            if btype == "highpass":
+                return impulse - low
+            band = self._windowed_sinc(cutoffs[1], sample_rate, w) - low
+            if btype == "bandpass":
+                return band
+            return impulse - band
+
+        return self._cached(("fir", btype, cutoffs, sample_rate, taps, window), build)
@@ -1,8 +1,18 @@
 import math
+import numpy as np
+from scipy.signal import lfilter, lfilter_zi, sosfilt, sosfilt_zi
+
+from FilterDesigner import FilterDesigner
+from ConvolutionProcessor import ConvolutionProcessor
+from FFTProcessor import FFTProcessor
+from STFTProcessor import STFTProcessor
+from Spectrum import Spectrum
 
 class FilterProcessor:
     def __init__(self):
-        pass
+        self.FilterDesigner = FilterDesigner()
+        self.ConvolutionProcessor = ConvolutionProcessor()
+        self.FFTProcessor = FFTProcessor()
 
     def _calculate_alpha_lp(self, cutoff, sample_rate):
         if cutoff <= 0: return 0
@@ -16,37 +26,208 @@ class FilterProcessor:
         rc = 1.0 / (2.0 * math.pi * cutoff)
         return rc / (rc + dt)
 
-    def apply_low_pass(self, signal, cutoff, sample_rate):
+    def get_low_pass_coeffs(self, cutoff, sample_rate):
+        # y[n] = y[n-1] + alpha * (x[n] - y[n-1])
         alpha = self._calculate_alpha_lp(cutoff, sample_rate)
-        
-        result = [0.0] * len(signal)
-        prev_y = signal[0]
-        
-        for i in range(len(signal)):
-            x = signal[i]
-            y = prev_y + alpha * (x - prev_y)
-            result[i] = y
-            prev_y = y
-            
-        return result
-
-    def apply_high_pass(self, signal, cutoff, sample_rate):
+        return np.array([alpha]), np.array([1.0, alpha - 1.0])
+
+    def get_high_pass_coeffs(self, cutoff, sample_rate):
+        # y[n] = alpha * (y[n-1] + x[n] - x[n-1])
         alpha = self._calculate_alpha_hp(cutoff, sample_rate)
-        
-        result = [0.0] * len(signal)
-        prev_y = 0.0
-        prev_x = signal[0]
-        
-        for i in range(len(signal)):
-            x = signal[i]
-            y = alpha * (prev_y + x - prev_x)
-            result[i] = y
-            prev_y = y
-            prev_x = x
-            
-        return result
-
-    def apply_band_pass(self, signal, low_cut, high_cut, sample_rate):
-        step1 = self.apply_high_pass(signal, low_cut, sample_rate)
-        step2 = self.apply_low_pass(step1, high_cut, sample_rate)
-        return step2
\ No newline at end of file
+        return np.array([alpha, -alpha]), np.array([1.0, -alpha])
+
+    def get_band_pass_coeffs(self, low_cut, high_cut, sample_rate):
+        # the cascade of both RC stages as a single second-order filter
+        b_hp, a_hp = self.get_high_pass_coeffs(low_cut, sample_rate)
+        b_lp, a_lp = self.get_low_pass_coeffs(high_cut, sample_rate)
+        return np.convolve(b_hp, b_lp), np.convolve(a_hp, a_lp)
+
+    def _run(self, b, a, x, zi, return_state):
+        if len(x) == 0:
+            result = np.zeros(x.shape)
+            return (result, zi) if return_state else result
+
+        # samples run down axis 0, so (samples, channels) arrays filter every channel at once
+        result, zf = lfilter(b, a, x, axis=0, zi=zi)
+        return (result, zf) if return_state else result
+
+    def _odd_extend(self, x, padlen):
+        # reflect the signal around its end points so the edges continue smoothly
+        left = 2.0 * x[:1] - x[padlen:0:-1]
+        right = 2.0 * x[-1:] - x[-2:-padlen - 2:-1]
+        return np.concatenate([left, x, right], axis=0)
+
+    def _check_zero_phase(self, zi, return_state):
+        # the backward pass needs the whole signal, so there is no state to carry between blocks
+        if zi is not None or return_state:
+            raise ValueError("Zero-phase filtering carries no state; zi and return_state cannot be used")
+
+    def apply_zero_phase(self, signal, coeffs, padlen=None):
+        x = np.asarray(signal, dtype=np.float64)
+        if isinstance(coeffs, tuple):
+            b, a = coeffs
+            steady = lfilter_zi(b, a)
+            run = lambda data, zi: lfilter(b, a, data, axis=0, zi=zi)[0]
+            order = max(len(a), len(b))
+        else:
+            sos = np.asarray(coeffs, dtype=np.float64)
+            steady = sosfilt_zi(sos)
+            run = lambda data, zi: sosfilt(sos, data, axis=0, zi=zi)[0]
+            order = 2 * len(sos) + 1
+
+        if len(x) == 0:
+            return np.zeros(x.shape)
+        if padlen is None:
+            padlen = 3 * order
+        padlen = min(padlen, len(x) - 1)
+
+        # the state takes one value per channel, broadcast along the trailing axes
+        steady = steady.reshape(steady.shape + (1,) * (x.ndim - 1))
+        extended = self._odd_extend(x, padlen) if padlen > 0 else x
+        forward = run(extended, steady * extended[0])
+        backward = run(forward[::-1], steady * forward[-1])[::-1]
+        return backward[padlen:len(backward) - padlen]
+
+    def apply_low_pass(self, signal, cutoff, sample_rate, zi=None, return_state=False, zero_phase=False):
+        x = np.asarray(signal, dtype=np.float64)
+        b, a = self.get_low_pass_coeffs(cutoff, sample_rate)
+        if zero_phase:
+            self._check_zero_phase(zi, return_state)
+            return self.apply_zero_phase(x, (b, a))
+        if zi is None:
+            # the output starts settled on the first sample, as y[-1] = x[0]
+            zi = np.multiply.outer(-a[1:], x[0] if len(x) else 0.0)
+        return self._run(b, a, x, zi, return_state)
+
+    def apply_high_pass(self, signal, cutoff, sample_rate, zi=None, return_state=False, zero_phase=False):
+        x = np.asarray(signal, dtype=np.float64)
+        b, a = self.get_high_pass_coeffs(cutoff, sample_rate)
+        if zero_phase:
+            self._check_zero_phase(zi, return_state)
+            return self.apply_zero_phase(x, (b, a))
+        if zi is None:
+            # x[-1] = x[0] and y[-1] = 0, so the first output is zero
+            zi = np.multiply.outer(b[1:], x[0] if len(x) else 0.0)
+        return self._run(b, a, x, zi, return_state)
+
+    def apply_band_pass(self, signal, low_cut, high_cut, sample_rate, zi=None, return_state=False,
+                        zero_phase=False):
+        if zero_phase:
+            self._check_zero_phase(zi, return_state)
+            return self.apply_zero_phase(signal, self.get_band_pass_coeffs(low_cut, high_cut, sample_rate))
+        zi_hp, zi_lp = zi if zi is not None else (None, None)
+        step1, zf_hp = self.apply_high_pass(signal, low_cut, sample_rate, zi_hp, return_state=True)
+        step2, zf_lp = self.apply_low_pass(step1, high_cut, sample_rate, zi_lp, return_state=True)
+        if return_state:
+            return step2, (zf_hp, zf_lp)
+        return step2
+
+    def apply_sos(self, signal, sos, zi=None, return_state=False, zero_phase=False):
+        x = np.asarray(signal, dtype=np.float64)
+        if zero_phase:
+            self._check_zero_phase(zi, return_state)
+            return self.apply_zero_phase(x, sos)
+        if len(x) == 0:
+            result = np.zeros(x.shape)
+            return (result, zi) if return_state else result
+
+        if zi is None:
+            # start every section in the steady state for the first sample
+            zi = np.multiply.outer(sosfilt_zi(sos), x[0])
+        result, zf = sosfilt(sos, x, axis=0, zi=zi)
+        return (result, zf) if return_state else result
+
+    def apply_iir(self, signal, family, btype, cutoffs, sample_rate, order=4, ripple_db=1.0,
+                  zi=None, return_state=False, zero_phase=False):
+        sos = self.FilterDesigner.design_sos(family, btype, order, cutoffs, sample_rate, ripple_db)
+        return self.apply_sos(signal, sos, zi, return_state, zero_phase)
+
+    def apply_fir(self, signal, btype, cutoffs, sample_rate, transition_width=None, window="hamming",
+                  compensate_delay=True):
+        x = np.asarray(signal, dtype=np.float64)
+        taps = self.FilterDesigner.design_fir(btype, cutoffs, sample_rate, transition_width, window)
+        if len(x) == 0:
+            return np.zeros(x.shape)
+
+        full = self.ConvolutionProcessor.convolve(x, taps, mode="full")
+        # a linear-phase filter delays everything by half its length
+        delay = (len(taps) - 1) // 2 if compensate_delay else 0
+        return full[delay:delay + len(x)]
+
+    def _low_pass_mask(self, freqs, cutoff, transition_width):
+        if transition_width <= 0:
+            return (freqs <= cutoff).astype(np.float64)
+        start = cutoff - transition_width / 2.0
+        ramp = np.clip((freqs - start) / transition_width, 0.0, 1.0)
+        return 0.5 * (1.0 + np.cos(np.pi * ramp))
+
+    def get_spectral_mask(self, freqs, btype=None, cutoffs=None, shape="brickwall",
+                          transition_width=None, eq_curve=None):
+        if shape == "eq":
+            if callable(eq_curve):
+                return np.asarray(eq_curve(freqs), dtype=np.float64)
+            eq_freqs, eq_gains_db = eq_curve
+            return 10.0 ** (np.interp(freqs, eq_freqs, eq_gains_db) / 20.0)
+
+        cutoffs = list(np.atleast_1d(cutoffs))
+        if shape == "brickwall":
+            width = 0.0
+        elif shape == "raised_cosine":
+            width = 0.1 * min(cutoffs) if transition_width is None else transition_width
+        else:
+            raise ValueError("Mask shape must be 'brickwall', 'raised_cosine' or 'eq'")
+
+        low = self._low_pass_mask(freqs, cutoffs[0], width)
+        if btype == "lowpass":
+            return low
+        if btype == "highpass":
+            return 1.0 - low
+        band = self._low_pass_mask(freqs, cutoffs[1], width) - low
+        if btype == "bandpass":
+            return band
+        if btype == "bandstop":
+            return 1.0 - band
+        raise ValueError(f"Unknown filter type: {btype}")
+
+    def apply_spectral_filter(self, signal, sample_rate, btype=None, cutoffs=None, shape="raised_cosine",
+                              transition_width=None, eq_curve=None, block_size=None, return_spectrum=False):
+        x = np.asarray(signal, dtype=np.float64)
+
+        if block_size is None or len(x) <= block_size:
+            spectrum = self.FFTProcessor.compute_rfft(x, sample_rate=sample_rate)
+            mask = self.get_spectral_mask(spectrum.freqs, btype, cutoffs, shape, transition_width, eq_curve)
+            filtered = Spectrum((spectrum.values.T * mask).T, sample_rate, len(x), onesided=True)
+            result = self.FFTProcessor.compute_irfft(filtered)
+            if not return_spectrum:
+                return result
+            # amplitude scaling shared with the block path: a sinusoid of amplitude A shows as A / 2
+            return result, filtered.freqs, filtered.magnitude / len(x)
+
+        # long signals: mask Hann-windowed blocks at 50% overlap and overlap-add them back
+        stft = STFTProcessor(block_size, block_size // 2, "hann")
+        mask = self.get_spectral_mask(stft.get_frequencies(sample_rate), btype, cutoffs, shape,
+                                      transition_width, eq_curve)
+        magnitude_sum = 0.0
+        frames = 0
+
+        def masked_frames():
+            nonlocal magnitude_sum, frames
+            # (samples, channels) input streams as (frames, channels, bins), so one mask covers every channel
+            chunks = (x[start:start + block_size] for start in range(0, len(x), block_size))
+            for spectra in stft.stream_stft(chunks):
+                spectra = spectra * mask
+                magnitude_sum += np.abs(spectra).sum(axis=0)
+                frames += len(spectra)
+                yield spectra
+
+        # the output is filled as the overlap-add produces it, so only a few blocks are ever in flight
+        result = np.empty(x.shape)
+        filled = 0
+        for part in stft.stream_istft(masked_frames(), len(x)):
+            result[filled:filled + len(part)] = part
+            filled += len(part)
+        if not return_spectrum:
+            return result
+        # only magnitudes survive the frame average, so a plain array is returned rather than a Spectrum
+        average = magnitude_sum / max(frames, 1) / np.sum(stft.window)
+        return result, stft.get_frequencies(sample_rate), average.T
@@ -0,0 +1,67 @@
+import numpy as np
+from collections import OrderedDict
+
+class GoertzelProcessor:
+    _cache_limit = 16
+    _responses = OrderedDict()
+
+    def __init__(self, block_size=2048):
+        self.block_size = block_size
+
+    def _get_omegas(self, freqs, sample_rate):
+        return 2.0 * np.pi * np.atleast_1d(np.asarray(freqs, dtype=np.float64)) / sample_rate
+
+    def _get_response(self, omegas):
+        # impulse response of the Goertzel resonator s[n] = x[n] + 2cos(w)s[n-1] - s[n-2],
+        # stored with one leading zero so that response[:, m + 1] == h[m]
+        key = (omegas.tobytes(), self.block_size)
+        cache = GoertzelProcessor._responses
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+
+        coeff = 2.0 * np.cos(omegas)
+        response = np.zeros((len(omegas), self.block_size + 2))
+        response[:, 1] = 1.0
+        for m in range(2, self.block_size + 2):
+            response[:, m] = coeff * response[:, m - 1] - response[:, m - 2]
+
+        cache[key] = response
+        if len(cache) > self._cache_limit:
+            cache.popitem(last=False)
+        return response
+
+    def _run(self, x, response, s1, s2):
+        for start in range(0, len(x), self.block_size):
+            block = x[start:start + self.block_size]
+            B = len(block)
+            new_s1 = s1 * response[:, B + 1] - s2 * response[:, B] + response[:, B:0:-1] @ block
+            new_s2 = s1 * response[:, B] - s2 * response[:, B - 1] + response[:, B - 1::-1] @ block
+            s1, s2 = new_s1, new_s2
+        return s1, s2
+
+    def _finish(self, omegas, s1, s2, N):
+        return np.exp(-1j * omegas * (N - 1)) * (s1 - np.exp(-1j * omegas) * s2)
+
+    def compute(self, signal, freqs, sample_rate):
+        x = np.asarray(signal, dtype=np.float64)
+        omegas = self._get_omegas(freqs, sample_rate)
+        response = self._get_response(omegas)
+        zeros = np.zeros(len(omegas))
+        s1, s2 = self._run(x, response, zeros, zeros)
+        return self._finish(omegas, s1, s2, len(x))
+
+    def compute_amplitudes(self, signal, freqs, sample_rate):
+        return np.abs(self.compute(signal, freqs, sample_rate)) / max(len(signal), 1)
+
+    def stream(self, chunks, freqs, sample_rate):
+        omegas = self._get_omegas(freqs, sample_rate)
+        response = self._get_response(omegas)
+        s1 = np.zeros(len(omegas))
+        s2 = np.zeros(len(omegas))
+        N = 0
+        for chunk in chunks:
+            x = np.asarray(chunk, dtype=np.float64)
+            s1, s2 = self._run(x, response, s1, s2)
+            N += len(x)
+        return self._finish(omegas, s1, s2, N)
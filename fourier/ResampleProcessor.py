@@ -0,0 +1,110 @@
+import math
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from FilterDesigner import FilterDesigner
+
+class ResampleProcessor:
+    def __init__(self, up=1, down=1, window="hamming", transition_ratio=0.1, block_size=65536):
+        if up < 1 or down < 1:
+            raise ValueError("Up and down factors must be positive integers")
+
+        common = math.gcd(up, down)
+        self.up = up // common
+        self.down = down // common
+        self.window = window
+        self.transition_ratio = transition_ratio
+        self.block_size = block_size
+        self.FilterDesigner = FilterDesigner()
+        self.taps = self._design_taps()
+        self.delay = (len(self.taps) - 1) // 2
+        self.phases = self._build_phases()
+
+    def get_output_rate(self, sample_rate):
+        return sample_rate * self.up / self.down
+
+    def get_output_length(self, n):
+        return -(-n * self.up // self.down)
+
+    def _design_taps(self):
+        if self.up == self.down:
+            return np.ones(1)
+
+        # frequencies are in units of the input rate, so the upsampled stream runs at `up`
+        rate = float(self.up)
+        nyquist = 0.5 * rate / max(self.up, self.down)
+        width = self.transition_ratio * nyquist
+        # the stop band begins right at the lower of the two Nyquist frequencies
+        taps = self.FilterDesigner.design_fir("lowpass", [nyquist - width / 2], rate, width, self.window)
+        return taps * self.up
+
+    def _build_phases(self):
+        # phase p holds taps p, p + up, p + 2 * up, ... reversed to line up with an input window
+        per_phase = -(-len(self.taps) // self.up)
+        padded = np.zeros(per_phase * self.up)
+        padded[:len(self.taps)] = self.taps
+        return padded.reshape(per_phase, self.up).T[:, ::-1].copy()
+
+    def _compute(self, buffer, start, first, stop):
+        L, M = self.up, self.down
+        width = self.phases.shape[1]
+        out = np.zeros((stop - first,) + buffer.shape[1:])
+        windows = sliding_window_view(buffer, width, axis=0)
+
+        # outputs L apart share a phase and step M samples through the input
+        for r in range(min(L, stop - first)):
+            position = (first + r) * M + self.delay
+            newest = position // L
+            count = len(range(first + r, stop, L))
+            offset = newest - (width - 1) - start
+            rows = windows[offset:offset + (count - 1) * M + 1:M]
+            out[r::L] = rows @ self.phases[position % L]
+        return out
+
+    def stream_resample(self, chunks):
+        L, M = self.up, self.down
+        history = self.phases.shape[1] - 1
+        buffer = None
+        start = -history
+        received = 0
+        produced = 0
+
+        for chunk in chunks:
+            chunk = np.asarray(chunk, dtype=np.float64)
+            if buffer is None:
+                buffer = np.zeros((history,) + chunk.shape[1:])
+            if len(chunk) == 0:
+                continue
+            buffer = np.concatenate([buffer, chunk])
+            received += len(chunk)
+
+            # only the outputs whose newest input sample has already arrived
+            stop = -(-(received * L - self.delay) // M)
+            if stop <= produced:
+                continue
+            out = self._compute(buffer, start, produced, stop)
+            produced = stop
+
+            needed = (produced * M + self.delay) // L - history
+            drop = min(max(needed - start, 0), len(buffer))
+            buffer = buffer[drop:]
+            start += drop
+            yield out
+
+        total = self.get_output_length(received)
+        if buffer is None or total <= produced:
+            return
+
+        # past the end the input is zero, so pad just far enough for the last output
+        newest = ((total - 1) * M + self.delay) // L
+        pad = max(newest + 1 - (start + len(buffer)), 0)
+        buffer = np.concatenate([buffer, np.zeros((pad,) + buffer.shape[1:])])
+        yield self._compute(buffer, start, produced, total)
+
+    def resample(self, signal):
+        x = np.asarray(signal, dtype=np.float64)
+        chunks = (x[i:i + self.block_size] for i in range(0, len(x), self.block_size))
+        parts = list(self.stream_resample(chunks))
+        if not parts:
+            return np.zeros((0,) + x.shape[1:])
+        return np.concatenate(parts)
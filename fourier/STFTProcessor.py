@@ -0,0 +1,152 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.io import wavfile
+
+from FFTProcessor import FFTProcessor
+
+class STFTProcessor:
+    def __init__(self, frame_size=1024, hop_size=512, window="hann"):
+        if frame_size <= 0 or hop_size <= 0 or hop_size > frame_size:
+            raise ValueError("Hop size must be between 1 and the frame size")
+
+        self.frame_size = frame_size
+        self.hop_size = hop_size
+        self.window_name = window
+        self.window = self.get_window(window, frame_size)
+        self.FFTProcessor = FFTProcessor()
+
+    def get_window(self, name, size):
+        # periodic windows: shifted copies at the hop size sum to a constant
+        phase = 2.0 * np.pi * np.arange(size) / size
+        if name == "hann":
+            return 0.5 - 0.5 * np.cos(phase)
+        if name == "hamming":
+            return 0.54 - 0.46 * np.cos(phase)
+        if name == "blackman":
+            return 0.42 - 0.5 * np.cos(phase) + 0.08 * np.cos(2 * phase)
+        if name == "rectangular":
+            return np.ones(size)
+        raise ValueError(f"Unknown window: {name}")
+
+    def get_frequencies(self, sample_rate):
+        return np.arange(self.frame_size // 2 + 1) * sample_rate / self.frame_size
+
+    def read_wav_chunks(self, path, chunk_size=65536, channel=0):
+        sample_rate, data = wavfile.read(path, mmap=True)
+        return sample_rate, self._iter_chunks(data, chunk_size, channel)
+
+    def _iter_chunks(self, data, chunk_size, channel):
+        for start in range(0, len(data), chunk_size):
+            chunk = data[start:start + chunk_size]
+            # channel=None keeps every channel as a trailing axis
+            if chunk.ndim > 1 and channel is not None:
+                chunk = chunk[:, channel]
+            yield np.array(chunk, dtype=np.float64)
+
+    def _transform_frames(self, buffer, n_frames):
+        # (samples, channels) buffers give (n_frames, channels, frame_size) windows
+        frames = sliding_window_view(buffer, self.frame_size, axis=0)[::self.hop_size][:n_frames]
+        spectra = self.FFTProcessor.compute_rfft_batch((frames * self.window).reshape(-1, self.frame_size))
+        return spectra.reshape(frames.shape[:-1] + (-1,))
+
+    def stream_stft(self, chunks):
+        # leading zeros give the first samples the same window coverage as the rest
+        lead = self.frame_size - self.hop_size
+        buffer = None
+        for chunk in chunks:
+            chunk = np.asarray(chunk, dtype=np.float64)
+            if buffer is None:
+                buffer = np.zeros((lead,) + chunk.shape[1:])
+            buffer = np.concatenate([buffer, chunk])
+            if len(buffer) < self.frame_size:
+                continue
+            n_frames = 1 + (len(buffer) - self.frame_size) // self.hop_size
+            yield self._transform_frames(buffer, n_frames)
+            buffer = buffer[n_frames * self.hop_size:]
+            lead = max(lead - n_frames * self.hop_size, 0)
+
+        if buffer is None:
+            return
+        # any real sample still buffered is missing at least one of its windows
+        remaining = len(buffer) - lead
+        if remaining > 0:
+            n_frames = 1 + (len(buffer) - 1) // self.hop_size
+            padded_length = (n_frames - 1) * self.hop_size + self.frame_size
+            buffer = np.concatenate([buffer, np.zeros((padded_length - len(buffer),) + buffer.shape[1:])])
+            yield self._transform_frames(buffer, n_frames)
+
+    def compute_stft(self, signal):
+        x = np.asarray(signal, dtype=np.float64)
+        batches = list(self.stream_stft([x]))
+        if not batches:
+            return np.zeros((0,) + x.shape[1:] + (self.frame_size // 2 + 1,), dtype=np.complex128)
+        return np.concatenate(batches)
+
+    def stream_wav_stft(self, path, chunk_size=65536, channel=0):
+        sample_rate, chunks = self.read_wav_chunks(path, chunk_size, channel)
+        return sample_rate, self.stream_stft(chunks)
+
+    def _get_overlap_norm(self):
+        blocks = -(-self.frame_size // self.hop_size)
+        squared = np.zeros(blocks * self.hop_size)
+        squared[:self.frame_size] = self.window ** 2
+        norm = squared.reshape(blocks, self.hop_size).sum(axis=0)
+        if norm.min() < 1e-10:
+            raise ValueError("Window and hop size do not allow reconstruction")
+        return norm
+
+    def stream_istft(self, spectra_batches, length=None):
+        hop = self.hop_size
+        blocks = -(-self.frame_size // hop)
+        norm = self._get_overlap_norm()
+        tail = None
+        skip = self.frame_size - hop
+        produced = 0
+
+        for spectra in spectra_batches:
+            # frames may carry extra axes between frame and bin, e.g. (n_frames, bands, bins)
+            spectra = np.atleast_2d(spectra)
+            n_frames, extra, bins = len(spectra), spectra.shape[1:-1], spectra.shape[-1]
+            if tail is None:
+                tail = np.zeros((blocks - 1,) + extra + (hop,))
+            if n_frames == 0:
+                continue
+            frames = np.zeros((n_frames,) + extra + (blocks * hop,))
+            frames[..., :self.frame_size] = self.FFTProcessor.compute_irfft_batch(
+                spectra.reshape(-1, bins), self.frame_size).reshape(spectra.shape[:-1] + (-1,)) * self.window
+            frames = frames.reshape((n_frames,) + extra + (blocks, hop))
+
+            acc = np.zeros((n_frames + blocks - 1,) + extra + (hop,))
+            acc[:blocks - 1] += tail
+            for b in range(blocks):
+                acc[b:b + n_frames] += frames[..., b, :]
+            tail = acc[n_frames:]
+
+            out, produced = self._trim(self._unframe(acc[:n_frames] / norm), produced, skip, length)
+            if len(out):
+                yield out
+
+        if tail is None:
+            return
+        out, produced = self._trim(self._unframe(tail / norm), produced, skip, length)
+        if len(out):
+            yield out
+
+    def _unframe(self, acc):
+        # (n, ..., hop) blocks back to (n * hop, ...) samples
+        return np.moveaxis(acc, -1, 1).reshape((-1,) + acc.shape[1:-1])
+
+    def _trim(self, out, produced, skip, length):
+        start = produced
+        produced += len(out)
+        begin = max(skip - start, 0)
+        end = len(out)
+        if length is not None:
+            end = min(end, skip + length - start)
+        return out[begin:max(begin, end)], produced
+
+    def compute_istft(self, spectra, length=None):
+        parts = list(self.stream_istft([spectra], length))
+        if not parts:
+            return np.zeros((0,) + np.shape(spectra)[1:-1])
+        return np.concatenate(parts)
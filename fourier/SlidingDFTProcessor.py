@@ -0,0 +1,53 @@
+import numpy as np
+
+class SlidingDFTProcessor:
+    def __init__(self, freqs, window_size, sample_rate, block_size=4096):
+        self.freqs = np.atleast_1d(np.asarray(freqs, dtype=np.float64))
+        self.window_size = window_size
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+
+        self.omegas = 2.0 * np.pi * self.freqs / sample_rate
+        self._rotation = np.exp(1j * self.omegas)
+        self._newest = np.exp(-1j * self.omegas * (window_size - 1))
+        self.reset()
+
+    def reset(self):
+        self.history = np.zeros(self.window_size)
+        self.position = 0
+        self.bins = np.zeros(len(self.omegas), dtype=np.complex128)
+
+    def update(self, sample):
+        oldest = self.history[self.position]
+        self.history[self.position] = sample
+        self.position = (self.position + 1) % self.window_size
+        self.bins = self._rotation * (self.bins - oldest) + sample * self._newest
+        return self.bins
+
+    def process(self, samples):
+        x = np.asarray(samples, dtype=np.float64)
+        result = np.empty((len(x), len(self.omegas)), dtype=np.complex128)
+        for start in range(0, len(x), self.block_size):
+            block = x[start:start + self.block_size]
+            result[start:start + len(block)] = self._process_block(block)
+        return result
+
+    def _process_block(self, block):
+        # update() is X_i = r * X_{i-1} + d_i with d_i = x_i * newest - r * oldest_i, so
+        # X_i = r^{i+1} * (X_{-1} + sum_{k<=i} r^{-(k+1)} * d_k): a prefix sum over the block only
+        W = self.window_size
+        L = len(block)
+        kept = min(L, W)
+        slots = (self.position + np.arange(kept)) % W
+        oldest = np.concatenate([self.history[slots], block[:L - kept]])
+        d = np.multiply.outer(block, self._newest) - np.multiply.outer(oldest, self._rotation)
+        k = np.arange(1, L + 1)
+        phasors = np.exp(1j * np.outer(k, self.omegas))
+        bins = phasors * (self.bins + np.cumsum(d / phasors, axis=0))
+
+        # only the last W samples stay in the circular history
+        tail = block[L - kept:]
+        self.history[(self.position + L - kept + np.arange(kept)) % W] = tail
+        self.position = (self.position + L) % W
+        self.bins = bins[-1].copy()
+        return bins
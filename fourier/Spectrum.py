@@ -0,0 +1,69 @@
+import numpy as np
+from functools import cached_property
+
+class Spectrum:
+    def __init__(self, values, sample_rate=None, n=None, onesided=False):
+        values = np.asarray(values)
+        if values.dtype != np.complex64 and values.dtype != np.complex128:
+            values = values.astype(np.complex128)
+
+        self.values = values
+        self.sample_rate = sample_rate
+        self.onesided = onesided
+        if n is None:
+            n = 2 * (values.shape[0] - 1) if onesided else values.shape[0]
+        self.n = n
+
+    def __len__(self):
+        # bins run down axis 0, so a (bins, channels) spectrum holds one column per channel
+        return self.values.shape[0]
+
+    def __getitem__(self, index):
+        return self.values[index]
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __array__(self, dtype=None, copy=None):
+        if copy:
+            return np.array(self.values, dtype=dtype)
+        return np.asarray(self.values, dtype=dtype)
+
+    def __repr__(self):
+        side = "one-sided" if self.onesided else "two-sided"
+        return f"Spectrum({len(self)} bins, n={self.n}, {side}, sample_rate={self.sample_rate})"
+
+    @cached_property
+    def magnitude(self):
+        return np.abs(self.values)
+
+    @cached_property
+    def phase(self):
+        return np.angle(self.values)
+
+    @cached_property
+    def power(self):
+        return self.values.real ** 2 + self.values.imag ** 2
+
+    @cached_property
+    def db(self):
+        floor = np.finfo(self.power.dtype).tiny
+        return 10.0 * np.log10(np.maximum(self.power, floor))
+
+    @cached_property
+    def freqs(self):
+        rate = 1.0 if self.sample_rate is None else self.sample_rate
+        if self.n == 0:
+            return np.zeros(0)
+        return np.arange(len(self)) * rate / self.n
+
+    def positive_half(self):
+        if self.onesided:
+            return self
+
+        half = Spectrum(self.values[:self.n // 2 + 1], self.sample_rate, self.n, onesided=True)
+        # views of anything already computed on the full spectrum are reused as-is
+        for name in ("magnitude", "phase", "power", "db", "freqs"):
+            if name in self.__dict__:
+                half.__dict__[name] = self.__dict__[name][:self.n // 2 + 1]
+        return half
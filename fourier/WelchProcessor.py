@@ -0,0 +1,79 @@
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from numpy.lib.stride_tricks import sliding_window_view
+
+from STFTProcessor import STFTProcessor
+
+class WelchProcessor:
+    def __init__(self, segment_size=1024, overlap=0.5, window="hann", batch_segments=256):
+        if not 0 <= overlap < 1:
+            raise ValueError("Overlap must be in [0, 1)")
+
+        self.segment_size = segment_size
+        self.hop_size = segment_size - int(segment_size * overlap)
+        self.batch_segments = batch_segments
+        self.STFTProcessor = STFTProcessor(segment_size, self.hop_size, window)
+        self.window = self.STFTProcessor.window
+
+    def _segment_power(self, buffer, n_segments):
+        segments = sliding_window_view(buffer, self.segment_size)[::self.hop_size][:n_segments]
+        total = np.zeros(self.segment_size // 2 + 1)
+        for start in range(0, n_segments, self.batch_segments):
+            batch = segments[start:start + self.batch_segments]
+            batch = batch - batch.mean(axis=1, keepdims=True)
+            spectra = self.STFTProcessor.FFTProcessor.compute_rfft_batch(batch * self.window)
+            total += (spectra.real ** 2 + spectra.imag ** 2).sum(axis=0)
+        return total
+
+    def _count_segments(self, length):
+        if length < self.segment_size:
+            return 0
+        return 1 + (length - self.segment_size) // self.hop_size
+
+    def _finish(self, total, count, sample_rate):
+        if count == 0:
+            raise ValueError("Signal is shorter than one segment")
+
+        psd = total / (count * sample_rate * np.sum(self.window ** 2))
+        # fold the negative frequencies into the one-sided estimate
+        if self.segment_size % 2 == 0:
+            psd[1:-1] *= 2
+        else:
+            psd[1:] *= 2
+        return self.STFTProcessor.get_frequencies(sample_rate), psd
+
+    def compute_psd(self, signal, sample_rate, workers=1):
+        x = np.asarray(signal, dtype=np.float64)
+        count = self._count_segments(len(x))
+        if workers <= 1 or count < 2 * workers:
+            return self._finish(self._segment_power(x, count), count, sample_rate)
+
+        bounds = np.linspace(0, count, workers + 1).astype(int)
+
+        def worker(first, last):
+            start = first * self.hop_size
+            stop = (last - 1) * self.hop_size + self.segment_size
+            return self._segment_power(x[start:stop], last - first)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            parts = pool.map(worker, bounds[:-1], bounds[1:])
+            total = sum(parts)
+        return self._finish(total, count, sample_rate)
+
+    def stream_psd(self, chunks, sample_rate):
+        total = np.zeros(self.segment_size // 2 + 1)
+        count = 0
+        buffer = np.zeros(0)
+        for chunk in chunks:
+            buffer = np.concatenate([buffer, np.asarray(chunk, dtype=np.float64)])
+            n_segments = self._count_segments(len(buffer))
+            if n_segments == 0:
+                continue
+            total += self._segment_power(buffer, n_segments)
+            count += n_segments
+            buffer = buffer[n_segments * self.hop_size:]
+        return self._finish(total, count, sample_rate)
+
+    def compute_wav_psd(self, path, chunk_size=65536, channel=0):
+        sample_rate, chunks = self.STFTProcessor.read_wav_chunks(path, chunk_size, channel)
+        return self.stream_psd(chunks, sample_rate)
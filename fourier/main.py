@@ -10,6 +10,9 @@ import numpy as np
 from DFTProcessor import DFTProcessor
 from FFTProcessor import FFTProcessor
 from FilterProcessor import FilterProcessor
+from WelchProcessor import WelchProcessor
+from ResampleProcessor import ResampleProcessor
+from FilterBankProcessor import FilterBankProcessor
 
 class App(tk.Tk):
     def __init__(self):
@@ -19,7 +22,7 @@ class App(tk.Tk):
         self.geometry("1400x750")
         self.resizable(False, False)
         
-        self.base_signal_data = [] 
+        self.base_signal_data = np.zeros(0)
         self.sample_rate = 44100
         self.dft_result = None
         
@@ -31,6 +34,7 @@ class App(tk.Tk):
         self.DFTProcessor = DFTProcessor()
         self.FFTProcessor = FFTProcessor()
         self.FilterProcessor = FilterProcessor()
+        self.WelchProcessor = WelchProcessor(segment_size=4096)
 
         self.columnconfigure(0, weight=1, uniform="group1")
         self.columnconfigure(1, weight=1, uniform="group1")
@@ -76,6 +80,13 @@ class App(tk.Tk):
         self.btn_play = ttk.Button(self.frame_1, text="PLAY", state="disabled", 
                                    command=lambda: self.play_sound(os.path.join(self.sounds_dir, self.combo_sounds.get())))
         self.btn_play.pack(pady=10, fill='x')
+
+        lbl_rate = ttk.Label(self.frame_1, text="Analysis rate (Hz):")
+        lbl_rate.pack(anchor="w")
+        self.combo_rate = ttk.Combobox(self.frame_1, values=["Original", "22050", "16000", "11025", "8000"], state="readonly")
+        self.combo_rate.current(0)
+        self.combo_rate.pack(fill='x', pady=(0, 5))
+        self.combo_rate.bind("<<ComboboxSelected>>", lambda event: self.update_eq_bands())
         
         self.base_plot_container = ttk.LabelFrame(self.frame_1, text="Base Plot (Full)", padding=5)
         self.base_plot_container.pack(pady=5, fill='x')
@@ -131,10 +142,25 @@ class App(tk.Tk):
 
         lbl_type = ttk.Label(self.filter_container, text="Type:")
         lbl_type.pack(anchor="w")
-        self.combo_filter = ttk.Combobox(self.filter_container, values=["Low Pass", "High Pass", "Band Pass"], state="readonly")
+        self.combo_filter = ttk.Combobox(self.filter_container, values=["Low Pass", "High Pass", "Band Pass", "Graphic EQ"], state="readonly")
         self.combo_filter.current(0)
         self.combo_filter.pack(fill='x', pady=2)
 
+        lbl_design = ttk.Label(self.filter_container, text="Design:")
+        lbl_design.pack(anchor="w")
+        self.combo_design = ttk.Combobox(self.filter_container, values=["RC", "Butterworth", "Chebyshev", "FIR", "Spectral"], state="readonly")
+        self.combo_design.current(0)
+        self.combo_design.pack(fill='x', pady=2)
+
+        lbl_order = ttk.Label(self.filter_container, text="Order [Butterworth/Chebyshev]:")
+        lbl_order.pack(anchor="w")
+        self.spin_order = ttk.Spinbox(self.filter_container, from_=1, to=12, increment=1)
+        self.spin_order.set(4)
+        self.spin_order.pack(fill='x', pady=2)
+
+        self.zero_phase = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.filter_container, text="Zero phase [RC/Butterworth/Chebyshev]", variable=self.zero_phase).pack(anchor="w", pady=2)
+
         input_frame = ttk.Frame(self.filter_container)
         input_frame.pack(fill='x', pady=5)
 
@@ -150,6 +176,13 @@ class App(tk.Tk):
         self.entry_cutoff2.insert(0, "5000")
         self.entry_cutoff2.pack(fill='x')
 
+        self.lbl_eq = ttk.Label(input_frame, wraplength=300)
+        self.lbl_eq.pack(anchor="w", pady=(5, 0))
+        self.update_eq_bands()
+        self.entry_eq = ttk.Entry(input_frame)
+        self.entry_eq.insert(0, ", ".join(["0"] * self.FilterBankProcessor.n_bands))
+        self.entry_eq.pack(fill='x')
+
         self.btn_filter = ttk.Button(self.filter_container, text="APPLY FILTER", state="disabled", command=self.on_filter_pressed)
         self.btn_filter.pack(pady=10, fill='x')
 
@@ -186,11 +219,9 @@ class App(tk.Tk):
         try:
             sample_rate, data = wavfile.read(sound_path)
             self.sample_rate = sample_rate
-            
-            if len(data.shape) > 1:
-                data = data[:, 0]
-                
-            self.base_signal_data = data.tolist()
+            self.update_eq_bands()
+            # every channel is kept as (samples, channels); the processors handle them in one pass
+            self.base_signal_data = data.astype(np.float64)
             
             image_path = os.path.join(self.plots_dir, self.base_name + ".png")
             
@@ -207,6 +238,29 @@ class App(tk.Tk):
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load sound: {e}")
 
+    def get_analysis_rate(self):
+        target = self.combo_rate.get()
+        if target == "Original" or int(target) >= self.sample_rate:
+            return self.sample_rate
+        return int(target)
+
+    def update_eq_bands(self):
+        # the top crossover stays an octave below Nyquist, so every band still exists at low analysis rates
+        fs = self.get_analysis_rate()
+        self.FilterBankProcessor = FilterBankProcessor(n_bands=8, f_high=min(8000.0, fs / 4.0))
+        centers = self.FilterBankProcessor.get_band_centers(fs)
+        self.lbl_eq.config(text="EQ gains (dB) at " + ", ".join(f"{c:.0f}" for c in centers) + " Hz:")
+
+    def get_analysis_signal(self):
+        fs = self.sample_rate
+        target = self.get_analysis_rate()
+        if target == fs:
+            return self.base_signal_data, fs
+
+        # everything downstream shrinks with the rate, so convert once before the transforms and filters
+        resampler = ResampleProcessor(target, int(fs))
+        return resampler.resample(self.base_signal_data), resampler.get_output_rate(fs)
+
     def play_sound(self, filename):
         if filename and os.path.exists(filename):
             try:
@@ -269,26 +323,32 @@ class App(tk.Tk):
             messagebox.showerror("Error", "Enter valid frequencies (numbers)")
             return
         
-        fs = self.sample_rate
-        signal = self.base_signal_data
+        signal, fs = self.get_analysis_signal()
         try:
             if filter_type == "Low Pass":
-                filtered_signal = self.FilterProcessor.apply_low_pass(signal, f1, fs)
+                filtered_signal, spectrum = self.apply_selected_filter("lowpass", signal, [f1], fs)
                 title_suffix = f"LP {f1}Hz"
-                self.save_filtered_sound(filtered_signal)
+                self.save_filtered_sound(filtered_signal, fs)
                 
             elif filter_type == "High Pass":
-                filtered_signal = self.FilterProcessor.apply_high_pass(signal, f1, fs)
+                filtered_signal, spectrum = self.apply_selected_filter("highpass", signal, [f1], fs)
                 title_suffix = f"HP {f1}Hz"
-                self.save_filtered_sound(filtered_signal)
+                self.save_filtered_sound(filtered_signal, fs)
                 
             elif filter_type == "Band Pass":
                 if f1 >= f2:
                     messagebox.showwarning("Warning", "Freq 1 must be < Freq 2 for Band Pass")
                     return
-                filtered_signal = self.FilterProcessor.apply_band_pass(signal, f1, f2, fs)
+                filtered_signal, spectrum = self.apply_selected_filter("bandpass", signal, [f1, f2], fs)
                 title_suffix = f"BP {f1}-{f2}Hz"
-                self.save_filtered_sound(filtered_signal)
+                self.save_filtered_sound(filtered_signal, fs)
+
+            elif filter_type == "Graphic EQ":
+                gains = [float(g) for g in self.entry_eq.get().split(",")]
+                filtered_signal, freqs, magnitude = self.FilterBankProcessor.apply_eq(signal, fs, gains, return_spectrum=True)
+                spectrum = (freqs, magnitude)
+                title_suffix = "EQ " + "/".join(f"{g:g}" for g in gains) + "dB"
+                self.save_filtered_sound(filtered_signal, fs)
         
         except Exception as e:
             messagebox.showerror("Filter Error", str(e))
@@ -308,28 +368,48 @@ class App(tk.Tk):
             f"Signal: {title_suffix}", "Time (s)", "Amp", path_time, times, t_data, kind='comparison', y_data_2=t_orig
         )
         self.display_plot(self.filter_time_lbl, path_time)
-        N_fft = 4096
-        if len(filtered_signal) > N_fft:
-            seg_filt = filtered_signal[:N_fft]
-        else:
-            seg_filt = filtered_signal
-            N_fft = len(seg_filt)
-
-        self.FFTProcessor.compute_fft(seg_filt)
-
-        raw_amps = self.FFTProcessor.get_amplitude_spectrum()
-        real_N = len(raw_amps)
-        amps = [val / real_N for val in raw_amps] 
-        freqs = [(k * fs / real_N) for k in range(real_N)]
         path_freq = os.path.join(self.plots_dir, f"{self.base_name}_filt_spec.png")
-        half_N = real_N // 2
-        
-        self.save_plot(
-            f"Spectrum: {title_suffix}", "Freq (Hz)", "Amp", path_freq, freqs[:half_N], amps[:half_N], kind='stem'
-        )
+        if spectrum is not None:
+            # spectral filters already hold the filtered spectrum, so no separate Welch pass is needed
+            freqs, magnitude = spectrum
+            first_channel = magnitude if magnitude.ndim == 1 else magnitude[:, 0]
+            self.save_plot(
+                f"Spectrum: {title_suffix}", "Freq (Hz)", "dB", path_freq, freqs, 20 * np.log10(first_channel + 1e-20), kind='stem'
+            )
+        else:
+            welch = self.WelchProcessor
+            if len(filtered_signal) < welch.segment_size:
+                welch = WelchProcessor(segment_size=len(filtered_signal))
+            first_channel = filtered_signal if filtered_signal.ndim == 1 else filtered_signal[:, 0]
+            freqs, psd = welch.compute_psd(first_channel, fs)
+            psd_db = 10 * np.log10(psd + 1e-20)
+            self.save_plot(
+                f"PSD: {title_suffix}", "Freq (Hz)", "dB/Hz", path_freq, freqs, psd_db, kind='stem'
+            )
         self.display_plot(self.filter_freq_lbl, path_freq)
 
-    def save_filtered_sound(self, filtered_signal):
+    def apply_selected_filter(self, btype, signal, cutoffs, fs):
+        # returns the filtered signal and, when the filter produces one, its (freqs, magnitude) spectrum
+        design = self.combo_design.get()
+        zero_phase = self.zero_phase.get()
+        if design in ("Butterworth", "Chebyshev"):
+            order = int(self.spin_order.get())
+            return self.FilterProcessor.apply_iir(signal, design.lower(), btype, cutoffs, fs, order=order,
+                                                  zero_phase=zero_phase), None
+        if design == "FIR":
+            return self.FilterProcessor.apply_fir(signal, btype, cutoffs, fs), None
+        if design == "Spectral":
+            filtered, freqs, magnitude = self.FilterProcessor.apply_spectral_filter(
+                signal, fs, btype, cutoffs, block_size=65536, return_spectrum=True)
+            return filtered, (freqs, magnitude)
+
+        if btype == "lowpass":
+            return self.FilterProcessor.apply_low_pass(signal, cutoffs[0], fs, zero_phase=zero_phase), None
+        if btype == "highpass":
+            return self.FilterProcessor.apply_high_pass(signal, cutoffs[0], fs, zero_phase=zero_phase), None
+        return self.FilterProcessor.apply_band_pass(signal, cutoffs[0], cutoffs[1], fs, zero_phase=zero_phase), None
+
+    def save_filtered_sound(self, filtered_signal, sample_rate):
         f_name_clean = self.combo_filter.get().replace(" ", "")
         out_filename = f"{self.base_name}_{f_name_clean}.wav"
         out_path = os.path.join(self.sounds_dir, out_filename)
@@ -337,7 +417,7 @@ class App(tk.Tk):
             arr = np.array(filtered_signal)
             arr = np.clip(arr, -32768, 32767)
             data_to_write = arr.astype(np.int16)
-            wavfile.write(out_path, self.sample_rate, data_to_write)
+            wavfile.write(out_path, int(sample_rate), data_to_write)
             self.btn_play_filt.config(state="normal", command=lambda: self.play_sound(out_path)
             )
         except Exception as e:
@@ -346,33 +426,30 @@ class App(tk.Tk):
     def run_transform(self, processor, N, suffix, lbl_amp, lbl_phase, lbl_restore, show_slice=False):
         if len(self.base_signal_data) == 0: return
         
-        fs = self.sample_rate
+        signal, fs = self.get_analysis_signal()
         
-        if len(self.base_signal_data) > N:
+        if len(signal) > N:
             start_pos = 0
-            source_segment = self.base_signal_data[start_pos : start_pos + N]
+            source_segment = signal[start_pos : start_pos + N]
         else:
-            source_segment = self.base_signal_data
+            source_segment = signal
             N = len(source_segment)
 
         try:
             if hasattr(processor, 'compute_fft'):
-                processor.compute_fft(source_segment)
+                spectrum = processor.compute_fft(source_segment, sample_rate=fs)
             else:
-                processor.compute_dft(source_segment)
+                spectrum = processor.compute_dft(source_segment, sample_rate=fs)
                 
-            raw_ampl = processor.get_amplitude_spectrum()
-            real_N = len(raw_ampl)
-            ampl = [val / real_N for val in raw_ampl] 
-
-            phase = processor.get_phase_spectrum()
-            phase = processor.get_phase_spectrum()
+            real_N = len(spectrum)
+            ampl = spectrum.magnitude / real_N
+            phase = spectrum.phase
             restored = processor.compute_ifft() if hasattr(processor, 'compute_ifft') else processor.compute_idft()
         except Exception as e:
             messagebox.showerror("Math Error", str(e))
             return
 
-        freqs = [(k * fs / N) for k in range(N)]
+        freqs = spectrum.freqs
         times = [(i / fs) for i in range(N)]
 
         path_amp = os.path.join(self.plots_dir, f"{self.base_name}_{suffix}_amp.png")
@@ -0,0 +1,29 @@
+import numpy as np
+
+from STFTProcessor import STFTProcessor
+
+def test_round_trip_on_hop_multiples():
+    rng = np.random.default_rng(0)
+    for frame_size, hop_size, window in [(1024, 512, "hann"), (1000, 300, "blackman")]:
+        stft = STFTProcessor(frame_size, hop_size, window)
+        for length in (hop_size, 2 * hop_size, 10 * hop_size, 10 * hop_size + 1):
+            x = rng.standard_normal(length)
+            restored = stft.compute_istft(stft.compute_stft(x), length)
+            assert np.allclose(restored, x, atol=1e-10)
+
+def test_streamed_chunks_match_one_shot():
+    rng = np.random.default_rng(1)
+    stft = STFTProcessor(1024, 512, "hann")
+    x = rng.standard_normal(4096)
+    chunks = [x[:1000], x[1000:1024], x[1024:]]
+    restored = np.concatenate(list(stft.stream_istft(stft.stream_stft(chunks), len(x))))
+    assert np.allclose(restored, x, atol=1e-10)
+
+def test_channels_match_single_channel():
+    rng = np.random.default_rng(2)
+    stft = STFTProcessor(1024, 256, "hann")
+    x = rng.standard_normal((5000, 2))
+    spectra = stft.compute_stft(x)
+    for c in range(2):
+        assert np.allclose(spectra[:, c], stft.compute_stft(x[:, c]))
+    assert np.allclose(stft.compute_istft(spectra, len(x)), x, atol=1e-10)
@@ -2,35 +2,72 @@ import numpy as np
 import math
 
 class ImageFilterProcessor:
-    def _convolve_channel(self, channel, kernel):
-        src_h, src_w = channel.shape
+    def _pad(self, channel, pad_h, pad_w):
+        # trailing colour axes are not padded, so all channels go through together
+        pad = ((pad_h, pad_h), (pad_w, pad_w)) + ((0, 0),) * (channel.ndim - 2)
+        return np.pad(channel.astype(np.float32), pad, mode='edge')
+
+    def _separate_kernel(self, kernel, tol=1e-6):
+        # a rank-1 kernel is the outer product of its first singular vectors
+        u, s, vt = np.linalg.svd(np.asarray(kernel, dtype=np.float64))
+        if s[0] == 0 or (len(s) > 1 and s[1] > tol * s[0]):
+            return None
+        scale = math.sqrt(s[0])
+        return u[:, 0] * scale, vt[0] * scale
+
+    def _convolve_channel(self, channel, kernel=None, col=None, row=None):
+        if col is None or row is None:
+            factors = self._separate_kernel(kernel)
+            if factors is None:
+                return self._convolve_full(channel, kernel)
+            col, row = factors
+        return self._convolve_separable(channel, col, row)
+
+    def _convolve_taps(self, padded, taps, axis, length):
+        output = np.zeros(padded.shape[:axis] + (length,) + padded.shape[axis + 1:], dtype=np.float32)
+        scratch = np.empty_like(output)
+        window = [slice(None)] * padded.ndim
+        for i, tap in enumerate(taps):
+            if tap == 0:
+                continue
+            window[axis] = slice(i, i + length)
+            np.multiply(padded[tuple(window)], np.float32(tap), out=scratch)
+            output += scratch
+        return output
+
+    def _convolve_separable(self, channel, col, row):
+        src_h, src_w = channel.shape[:2]
+        # edge padding is separable too, so a row pass then a column pass match the 2-D result
+        rows = self._convolve_taps(self._pad(channel, 0, len(row) // 2), row, 1, src_w)
+        return self._convolve_taps(self._pad(rows, len(col) // 2, 0), col, 0, src_h)
+
+    def _convolve_full(self, channel, kernel):
+        src_h, src_w = channel.shape[:2]
         k_h, k_w = kernel.shape
-        pad_h, pad_w = k_h // 2, k_w // 2
-        padded = np.pad(channel, ((pad_h, pad_h), (pad_w, pad_w)), mode='edge')
-        
-        output = np.zeros_like(channel)
-        for i in range(src_h):
-            for j in range(src_w):
-                roi = padded[i : i + k_h, j : j + k_w]
-                val = np.sum(roi * kernel)
-                output[i, j] = val
+        padded = self._pad(channel, k_h // 2, k_w // 2)
+
+        # one whole-image multiply-add per kernel tap instead of a window per pixel
+        output = np.zeros(channel.shape, dtype=np.float32)
+        scratch = np.empty_like(output)
+        for i in range(k_h):
+            for j in range(k_w):
+                if kernel[i, j] == 0:
+                    continue
+                np.multiply(padded[i : i + src_h, j : j + src_w], np.float32(kernel[i, j]), out=scratch)
+                output += scratch
         return output
 
-    def apply_convolution(self, image, kernel):
+    def apply_convolution(self, image, kernel=None, col=None, row=None):
         if len(image.shape) == 2:
-            res = self._convolve_channel(image, kernel)
-        else: 
-            channels = []
-            for c in range(3):
-                channels.append(self._convolve_channel(image[:, :, c], kernel))
-            res = np.dstack(channels)
+            res = self._convolve_channel(image, kernel, col, row)
+        else:
+            res = self._convolve_channel(image[:, :, :3], kernel, col, row)
         return np.clip(res, 0, 255).astype(np.uint8)
 
     def apply_box_blur(self, image, kernel_size=3):
         if kernel_size < 1: return image
-        kernel = np.ones((kernel_size, kernel_size), dtype=np.float32)
-        kernel /= (kernel_size * kernel_size)
-        return self.apply_convolution(image, kernel)
+        vector = np.full(kernel_size, 1.0 / kernel_size)
+        return self.apply_convolution(image, col=vector, row=vector)
     
     def _get_gaussian_kernel(self, size, sigma):
         k = size // 2
@@ -39,10 +76,14 @@ class ImageFilterProcessor:
         g =  np.exp(-((x**2 + y**2) / (2.0*sigma**2))) * normal
         return g
 
+    def _get_gaussian_vector(self, size, sigma):
+        kernel = self._get_gaussian_kernel(size, sigma)
+        # the 2-D Gaussian is an outer product, so its row sums give the normalised 1-D factor
+        return kernel.sum(axis=0) / kernel.sum()
+
     def apply_gaussian_blur(self, image, kernel_size=3, sigma=1.0):
-        kernel = self._get_gaussian_kernel(kernel_size, sigma)
-        kernel /= np.sum(kernel)
-        return self.apply_convolution(image, kernel)
+        vector = self._get_gaussian_vector(kernel_size, sigma)
+        return self.apply_convolution(image, col=vector, row=vector)
 
     def apply_median_filter(self, image, kernel_size=3):
         h, w = image.shape[:2]
@@ -65,26 +106,21 @@ class ImageFilterProcessor:
                     
         return output.astype(np.uint8)
     
+    def _get_sobel_gradients(self, gray):
+        # Gx = [1, 2, 1]^T * [-1, 0, 1] and Gy is its transpose
+        smooth = np.array([1, 2, 1], dtype=np.float32)
+        diff = np.array([-1, 0, 1], dtype=np.float32)
+        gx = self._convolve_channel(gray, col=smooth, row=diff)
+        gy = self._convolve_channel(gray, col=diff, row=smooth)
+        return gx, gy
+
     def apply_sobel(self, image):
         if len(image.shape) == 3:
             gray = np.dot(image[...,:3], [0.299, 0.587, 0.114])
         else:
             gray = image
 
-        Gx_kernel = np.array([
-            [-1, 0, 1],
-            [-2, 0, 2],
-            [-1, 0, 1]
-        ], dtype=np.float32)
-
-        Gy_kernel = np.array([
-            [-1, -2, -1],
-            [ 0,  0,  0],
-            [ 1,  2,  1]
-        ], dtype=np.float32)
-
-        gx = self._convolve_channel(gray, Gx_kernel)
-        gy = self._convolve_channel(gray, Gy_kernel)
+        gx, gy = self._get_sobel_gradients(gray)
 
         magnitude = np.sqrt(gx**2 + gy**2)
         
@@ -99,20 +135,7 @@ class ImageFilterProcessor:
         else:
             gray = image
 
-        Gx_kernel = np.array([
-            [-1, 0, 1],
-            [-2, 0, 2],
-            [-1, 0, 1]
-        ], dtype=np.float32)
-
-        Gy_kernel = np.array([
-            [-1, -2, -1],
-            [ 0,  0,  0],
-            [ 1,  2,  1]
-        ], dtype=np.float32)
-
-        gx = self._convolve_channel(gray, Gx_kernel)
-        gy = self._convolve_channel(gray, Gy_kernel)
+        gx, gy = self._get_sobel_gradients(gray)
 
         magnitude = np.sqrt(gx**2 + gy**2)
 
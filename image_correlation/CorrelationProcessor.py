@@ -0,0 +1,151 @@
+import os
+import sys
+import numpy as np
+
+_image_convolution = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "image_convolution")
+if _image_convolution not in sys.path:
+    sys.path.append(_image_convolution)
+from ImageFilterProcessor import ImageFilterProcessor
+
+class CorrelationProcessor:
+    def __init__(self, blur_size=5, blur_sigma=1.0):
+        self.ImageFilterProcessor = ImageFilterProcessor()
+        self.blur_kernel = self.ImageFilterProcessor._get_gaussian_vector(blur_size, blur_sigma)
+
+    def _to_gray(self, image):
+        if len(image.shape) == 3:
+            return np.dot(image[..., :3], [0.299, 0.587, 0.114])
+        return image.astype(np.float64)
+
+    def _integral(self, image):
+        integral = np.zeros((image.shape[0] + 1, image.shape[1] + 1))
+        np.cumsum(np.cumsum(image, axis=0), axis=1, out=integral[1:, 1:])
+        return integral
+
+    def _window_sums(self, integral, h, w):
+        return (integral[h:, w:] - integral[:-h, w:]
+                - integral[h:, :-w] + integral[:-h, :-w])
+
+    def compute_ncc(self, image, template):
+        img = self._to_gray(image)
+        tpl = self._to_gray(template)
+        H, W = img.shape
+        h, w = tpl.shape
+        if h > H or w > W:
+            raise ValueError("Template must not be larger than the image")
+
+        # centring the image keeps the integral-image sums small and the variance exact
+        img = img - img.mean()
+        tpl = tpl - tpl.mean()
+        tpl_energy = np.sum(tpl ** 2)
+
+        spectrum = np.fft.rfft2(img) * np.conj(np.fft.rfft2(tpl, s=(H, W)))
+        numerator = np.fft.irfft2(spectrum, s=(H, W))[:H - h + 1, :W - w + 1]
+
+        n = h * w
+        sums = self._window_sums(self._integral(img), h, w)
+        sums_sq = self._window_sums(self._integral(img ** 2), h, w)
+        variance = np.maximum(sums_sq - sums ** 2 / n, 0)
+        denominator = np.sqrt(variance * tpl_energy)
+
+        score = np.zeros_like(numerator)
+        valid = denominator > 1e-8 * max(denominator.max(), 1e-300)
+        score[valid] = numerator[valid] / denominator[valid]
+        return np.clip(score, -1.0, 1.0)
+
+    def find_peaks(self, score_map, top_k=1, min_distance=(1, 1)):
+        scores = score_map.copy()
+        dy, dx = min_distance
+        peaks = []
+        for _ in range(top_k):
+            idx = np.argmax(scores)
+            y, x = np.unravel_index(idx, scores.shape)
+            if not np.isfinite(scores[y, x]):
+                break
+            peaks.append((int(y), int(x), float(score_map[y, x])))
+            scores[max(y - dy + 1, 0):y + dy, max(x - dx + 1, 0):x + dx] = -np.inf
+        return peaks
+
+    def match_template(self, image, template, top_k=1):
+        score_map = self.compute_ncc(image, template)
+        h, w = template.shape[:2]
+        peaks = self.find_peaks(score_map, top_k, min_distance=(h // 2 + 1, w // 2 + 1))
+        return peaks, score_map
+
+    def _blur_and_halve(self, gray):
+        blurred = self.ImageFilterProcessor._convolve_separable(gray, self.blur_kernel, self.blur_kernel)
+        return blurred[::2, ::2]
+
+    def build_pyramid(self, gray, levels):
+        pyramid = [gray]
+        for _ in range(levels):
+            pyramid.append(self._blur_and_halve(pyramid[-1]))
+        return pyramid
+
+    def _auto_levels(self, template_shape, min_template_size):
+        levels = 0
+        h, w = template_shape[:2]
+        while min(h, w) >= 2 * min_template_size:
+            h, w = h // 2, w // 2
+            levels += 1
+        return levels
+
+    def _refine(self, gray, tpl, y, x, radius):
+        H, W = gray.shape
+        h, w = tpl.shape
+        y0, y1 = max(y - radius, 0), min(y + radius, H - h)
+        x0, x1 = max(x - radius, 0), min(x + radius, W - w)
+        if y0 > y1 or x0 > x1:
+            return None
+        region = gray[y0:y1 + h, x0:x1 + w]
+        score = self.compute_ncc(region, tpl)
+        by, bx = np.unravel_index(np.argmax(score), score.shape)
+        return (int(y0 + by), int(x0 + bx), float(score[by, bx]))
+
+    def match_template_pyramid(self, image, template, top_k=1, levels=None, candidates=None,
+                               refine_radius=2, min_template_size=8):
+        img = self._to_gray(image)
+        tpl = self._to_gray(template)
+        if levels is None:
+            levels = self._auto_levels(tpl.shape, min_template_size)
+        if candidates is None:
+            candidates = max(4 * top_k, 8)
+
+        img_pyr = self.build_pyramid(img, levels)
+        tpl_pyr = self.build_pyramid(tpl, levels)
+
+        h, w = tpl_pyr[-1].shape
+        coarse = self.compute_ncc(img_pyr[-1], tpl_pyr[-1])
+        found = self.find_peaks(coarse, candidates, min_distance=(h // 2 + 1, w // 2 + 1))
+
+        for level in range(levels - 1, -1, -1):
+            refined = {}
+            for y, x, _ in found:
+                match = self._refine(img_pyr[level], tpl_pyr[level], 2 * y, 2 * x, refine_radius)
+                if match is not None:
+                    refined[match[:2]] = match
+            found = sorted(refined.values(), key=lambda m: -m[2])
+
+        h, w = tpl.shape
+        peaks = []
+        for y, x, score in found:
+            if all(abs(y - py) > h // 2 or abs(x - px) > w // 2 for py, px, _ in peaks):
+                peaks.append((y, x, score))
+            if len(peaks) == top_k:
+                break
+        return peaks
+
+    def draw_matches(self, image, peaks, template_shape, color=(255, 0, 0), thickness=2):
+        if len(image.shape) == 2:
+            result = np.dstack([image] * 3).astype(np.uint8)
+        else:
+            result = image[..., :3].astype(np.uint8).copy()
+
+        h, w = template_shape[:2]
+        for y, x, _ in peaks:
+            y2, x2 = y + h, x + w
+            result[y:y + thickness, x:x2] = color
+            result[y2 - thickness:y2, x:x2] = color
+            result[y:y2, x:x + thickness] = color
+            result[y:y2, x2 - thickness:x2] = color
+        return result
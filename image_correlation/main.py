@@ -0,0 +1,126 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from PIL import Image, ImageTk
+import numpy as np
+
+from CorrelationProcessor import CorrelationProcessor
+
+class CorrelationApp(tk.Tk):
+    def __init__(self):
+        super().__init__()
+
+        self.title("Template Matching Tool")
+        self.geometry("1000x600")
+        self.resizable(False, False)
+
+        self.processor = CorrelationProcessor()
+
+        self.image_np = None
+        self.template_np = None
+
+        self.columnconfigure(0, weight=1)
+        self.columnconfigure(1, weight=1)
+        self.rowconfigure(0, weight=1)
+        self.rowconfigure(1, weight=0)
+
+        self.frame_image = ttk.LabelFrame(self, text="Image / Matches")
+        self.frame_image.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
+
+        self.lbl_image = ttk.Label(self.frame_image, text="Load an image...")
+        self.lbl_image.pack(expand=True)
+
+        self.frame_score = ttk.LabelFrame(self, text="Template / Score Map")
+        self.frame_score.grid(row=0, column=1, sticky="nsew", padx=5, pady=5)
+
+        self.lbl_template = ttk.Label(self.frame_score, text="Load a template...")
+        self.lbl_template.pack(pady=5)
+
+        self.lbl_score = ttk.Label(self.frame_score, text="Score map will appear here")
+        self.lbl_score.pack(expand=True)
+
+        self.control_panel = ttk.Frame(self, padding=10)
+        self.control_panel.grid(row=1, column=0, columnspan=2, sticky="ew")
+
+        ttk.Button(self.control_panel, text="Load Image", command=self.load_image).pack(side="left", padx=10)
+        ttk.Button(self.control_panel, text="Load Template", command=self.load_template).pack(side="left", padx=10)
+
+        ttk.Label(self.control_panel, text="Matches:").pack(side="left", padx=(20, 5))
+        self.spin_top_k = ttk.Spinbox(self.control_panel, from_=1, to=20, increment=1, width=5)
+        self.spin_top_k.set(1)
+        self.spin_top_k.pack(side="left", padx=5)
+
+        self.use_pyramid = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.control_panel, text="Pyramid search", variable=self.use_pyramid).pack(side="left", padx=(20, 5))
+
+        self.btn_match = ttk.Button(self.control_panel, text="FIND", state="disabled", command=self.match)
+        self.btn_match.pack(side="right", padx=10)
+
+    def _open_image(self):
+        file_path = filedialog.askopenfilename(filetypes=[("Images", "*.jpg *.jpeg *.png *.bmp")])
+        if not file_path:
+            return None
+        try:
+            return np.array(Image.open(file_path).convert('RGB'))
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not load image: {e}")
+            return None
+
+    def load_image(self):
+        image = self._open_image()
+        if image is None:
+            return
+        self.image_np = image
+        self.show_image(Image.fromarray(image), self.lbl_image)
+        self.update_buttons()
+
+    def load_template(self):
+        template = self._open_image()
+        if template is None:
+            return
+        self.template_np = template
+        self.show_image(Image.fromarray(template), self.lbl_template, (200, 150))
+        self.update_buttons()
+
+    def update_buttons(self):
+        if self.image_np is not None and self.template_np is not None:
+            self.btn_match.config(state="normal")
+
+    def show_image(self, pil_image, label_widget, size=(480, 400)):
+        display_img = pil_image.copy()
+        display_img.thumbnail(size)
+
+        tk_img = ImageTk.PhotoImage(display_img)
+        label_widget.config(image=tk_img, text="")
+        label_widget.image = tk_img
+
+    def match(self):
+        if self.image_np is None or self.template_np is None:
+            return
+
+        self.config(cursor="watch")
+        self.update()
+
+        try:
+            top_k = int(self.spin_top_k.get())
+            if self.use_pyramid.get():
+                peaks = self.processor.match_template_pyramid(self.image_np, self.template_np, top_k=top_k)
+                self.lbl_score.config(image='', text="No score map in pyramid mode")
+            else:
+                peaks, score_map = self.processor.match_template(self.image_np, self.template_np, top_k=top_k)
+                score_np = ((score_map + 1.0) * 127.5).astype(np.uint8)
+                self.show_image(Image.fromarray(score_np, mode='L'), self.lbl_score)
+
+            result_np = self.processor.draw_matches(self.image_np, peaks, self.template_np.shape)
+            self.show_image(Image.fromarray(result_np, mode='RGB'), self.lbl_image)
+
+            lines = [f"({x}, {y}): {score:.3f}" for y, x, score in peaks]
+            messagebox.showinfo("Matches", "\n".join(lines))
+
+        except Exception as e:
+            messagebox.showerror("Error during matching", str(e))
+        finally:
+            self.config(cursor="")
+
+if __name__ == "__main__":
+    app = CorrelationApp()
+    app.mainloop()